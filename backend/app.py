@@ -5,25 +5,53 @@ Integrates with local LLM (Ollama)
 Manages interview state and scoring
 """
 
-from fastapi import FastAPI, WebSocket, HTTPException
+from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-import json
+import orjson
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional
 import logging
 import os
 
-from interview_manager import InterviewManager
+from interview_manager import InterviewManager, drain_background_tasks, llm_slots_available, LLM_MAX_CONCURRENCY
 from llm_engine import LLMEngine
 from audio_processor import AudioProcessor
-from data_storage import DataStorage, GoogleSheetsStorage
+from data_storage import DataStorage, AsyncDataStorage, SQLiteDataStorage, GoogleSheetsStorage
+from session_store import SessionStore
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (raise LOG_LEVEL to WARNING to keep handlers off the hot path)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Voice Interviewer", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize and warm the LLM connection on startup, persist caches on shutdown"""
+    logger.info("Starting AI Voice Interviewer Backend...")
+    try:
+        await llm_engine.initialize()
+        logger.info("LLM Engine initialized successfully")
+    except Exception as e:
+        logger.warning("LLM initialization failed (will retry on first use): %s", e)
+    # Don't raise - let the app start and try again when needed
+
+    yield
+
+    await drain_background_tasks()
+    llm_engine.close()
+    if data_storage:
+        data_storage.close()
+
+
+app = FastAPI(
+    title="AI Voice Interviewer",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 
 class StartInterviewPayload(BaseModel):
@@ -47,20 +75,25 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Initialize components
 llm_engine = LLMEngine(model="gemini-1.5-flash")  # Using Google Gemini
-interview_sessions = {}
 audio_processor = AudioProcessor()
 
 # Initialize data storage
 storage_mode = os.getenv("STORAGE_MODE", "local").lower()
 data_storage = None
 if storage_mode in {"local", "both"}:
-    data_storage = DataStorage(storage_dir="interview_data")
+    if os.getenv("STORAGE_BACKEND", "jsonl").lower() == "sqlite":
+        # Indexed lookups and single-row inserts in interview_data/interviews.db
+        data_storage = SQLiteDataStorage(storage_dir="interview_data")
+    else:
+        # Writes are batched on a background thread; reads are served from memory
+        data_storage = AsyncDataStorage(DataStorage(storage_dir="interview_data"))
 
 # Initialize Google Sheets (optional - requires credentials)
 google_sheets = None
@@ -72,20 +105,19 @@ try:
     else:
         logger.info("Google Sheets integration disabled (credentials not found)")
 except Exception as e:
-    logger.warning(f"Google Sheets initialization failed: {e}")
+    logger.warning("Google Sheets initialization failed: %s", e)
     google_sheets = None
 
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize LLM on startup"""
-    logger.info("Starting AI Voice Interviewer Backend...")
-    try:
-        await llm_engine.initialize()
-        logger.info("LLM Engine initialized successfully")
-    except Exception as e:
-        logger.warning(f"LLM initialization failed (will retry on first use): {e}")
-    # Don't raise - let the app start and try again when needed
+# Active interview sessions (shared through Redis when SESSION_REDIS_URL is set)
+session_store = SessionStore(
+    restore=lambda state: InterviewManager.from_dict(
+        state,
+        llm_engine=llm_engine,
+        data_storage=data_storage,
+        google_sheets=google_sheets,
+        google_sheet_name=google_sheet_name
+    )
+)
 
 
 @app.post("/api/start-interview")
@@ -118,10 +150,13 @@ async def start_interview(payload: StartInterviewPayload):
             google_sheets=google_sheets,
             google_sheet_name=google_sheet_name
         )
-        interview_sessions[interview_manager.session_id] = interview_manager
+        interview_manager.cached_content = await llm_engine.create_context_cache(
+            job_description, difficulty
+        )
 
         # Generate first question
         first_question = await interview_manager.generate_first_question()
+        await session_store.put(interview_manager)
 
         return {
             "status": "started",
@@ -132,7 +167,7 @@ async def start_interview(payload: StartInterviewPayload):
         }
 
     except Exception as e:
-        logger.error(f"Error starting interview: {e}")
+        logger.error("Error starting interview: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -148,22 +183,53 @@ async def submit_answer(payload: SubmitAnswerPayload):
     }
     """
     try:
-        interview_manager = interview_sessions.get(payload.session_id)
+        interview_manager = await session_store.get(payload.session_id)
         if not interview_manager:
             raise HTTPException(status_code=400, detail="No active interview session")
 
         answer = payload.answer
 
-        # Process answer and generate next question
-        result = await interview_manager.process_answer(answer)
+        # Process answer and generate next question. Store the session even if
+        # this fails, so a retry resumes the turn instead of redoing its LLM calls
+        try:
+            result = await interview_manager.process_answer(answer)
+        finally:
+            await session_store.put(interview_manager)
 
         return result
 
     except Exception as e:
-        logger.error(f"Error submitting answer: {e}")
+        logger.error("Error submitting answer: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/submit-answer/stream")
+async def submit_answer_stream(payload: SubmitAnswerPayload):
+    """
+    Submit candidate answer and stream the next question as it is generated
+
+    Responds with newline-delimited JSON: {"type": "token", "text": ...} frames,
+    then a {"type": "done", "result": ...} frame holding the /api/submit-answer result
+    (on the last answer, the final report frames are streamed instead of tokens)
+    """
+    interview_manager = await session_store.get(payload.session_id)
+    if not interview_manager:
+        raise HTTPException(status_code=400, detail="No active interview session")
+
+    async def frames():
+        try:
+            async for event in interview_manager.process_answer_stream(payload.answer):
+                yield orjson.dumps(event) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error("Error streaming answer: %s", e)
+            yield orjson.dumps({"type": "error", "detail": str(e)}) + b"\n"
+        finally:
+            await session_store.put(interview_manager)
+
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
+
 @app.post("/api/end-interview")
 async def end_interview(payload: EndInterviewPayload):
     """
@@ -175,14 +241,14 @@ async def end_interview(payload: EndInterviewPayload):
     }
     """
     try:
-        interview_manager = interview_sessions.get(payload.session_id)
+        interview_manager = await session_store.get(payload.session_id)
         if not interview_manager:
             raise HTTPException(status_code=400, detail="No active interview session")
 
         # Generate final report
         report = await interview_manager.generate_final_report()
 
-        interview_sessions.pop(payload.session_id, None)
+        await session_store.pop(payload.session_id)
 
         return {
             "status": "completed",
@@ -190,7 +256,7 @@ async def end_interview(payload: EndInterviewPayload):
         }
 
     except Exception as e:
-        logger.error(f"Error ending interview: {e}")
+        logger.error("Error ending interview: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -204,27 +270,41 @@ async def websocket_interview(websocket: WebSocket, session_id: str):
 
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
 
-            # Handle different message types
-            if message.get("type") == "audio":
-                # Process audio stream
-                audio_data = message.get("audio")
+            if frame.get("bytes") is not None:
+                # Raw audio (PCM/Opus) arrives as binary frames, no base64 round-trip
+                audio_data = frame["bytes"]
                 # Convert audio to text using speech-to-text
                 # For now, just echo back
-                pass
+                continue
 
-            elif message.get("type") == "answer":
-                # Handle text answer
+            # Text frames carry JSON control messages
+            message = orjson.loads(frame["text"])
+
+            if message.get("type") == "answer":
+                # Handle text answer, streaming the next question token by token
                 answer = message.get("answer")
-                interview_manager = interview_sessions.get(session_id)
+                interview_manager = await session_store.get(session_id)
+                if interview_manager:
+                    try:
+                        async for event in interview_manager.process_answer_stream(answer):
+                            await websocket.send_text(orjson.dumps(event).decode())
+                    finally:
+                        await session_store.put(interview_manager)
+
+            elif message.get("type") == "end":
+                # End interview, streaming the final report as its feedback is generated
+                interview_manager = await session_store.get(session_id)
                 if interview_manager:
-                    result = await interview_manager.process_answer(answer)
-                    await websocket.send_text(json.dumps(result))
+                    async for event in interview_manager.generate_final_report_stream():
+                        await websocket.send_text(orjson.dumps(event).decode())
+                    await session_store.pop(session_id)
 
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         await websocket.close(code=1000)
 
 
@@ -242,16 +322,22 @@ async def health_check():
     return {
         "status": "healthy",
         "llm_ready": llm_engine.is_initialized(),
+        "llm_cache": llm_engine.cache.stats(),
+        "semantic_cache": llm_engine.semantic_cache.stats() if llm_engine.semantic_cache else None,
+        "llm_concurrency": {"limit": LLM_MAX_CONCURRENCY, "available": llm_slots_available()},
         "storage_mode": storage_status,
         "sheet_name": google_sheet_name if google_sheets and google_sheets.is_initialized() else None
     }
 
 
 @app.post("/api/export/{session_id}")
-async def export_to_sheets(session_id: str):
+async def export_to_sheets(session_id: str, background_tasks: BackgroundTasks):
     """
     Manually export an interview session to Google Sheets
     
+    The export runs as a background task after the response is sent,
+    so the blocking Sheets API calls never stall the event loop.
+    
     Args:
         session_id: The session ID to export
     """
@@ -263,25 +349,25 @@ async def export_to_sheets(session_id: str):
             )
         
         # Try to get the interview data from active sessions
-        interview_manager = interview_sessions.get(session_id)
+        interview_manager = await session_store.get(session_id)
         if interview_manager:
             # Get current state and export
             state = interview_manager.get_state()
-            google_sheets.export_interview(state, google_sheet_name)
+            background_tasks.add_task(google_sheets.export_interview, state, google_sheet_name)
             return {
                 "status": "success",
-                "message": f"Interview exported to '{google_sheet_name}'",
+                "message": f"Interview export to '{google_sheet_name}' started",
                 "session_id": session_id
             }
         
         # If not in active sessions, try to get from data storage
         if data_storage:
-            interview_data = data_storage.get_interview_by_id(session_id)
+            interview_data = await asyncio.to_thread(data_storage.get_interview_by_id, session_id)
             if interview_data:
-                google_sheets.export_interview(interview_data, google_sheet_name)
+                background_tasks.add_task(google_sheets.export_interview, interview_data, google_sheet_name)
                 return {
                     "status": "success",
-                    "message": f"Interview exported to '{google_sheet_name}'",
+                    "message": f"Interview export to '{google_sheet_name}' started",
                     "session_id": session_id
                 }
         
@@ -290,17 +376,37 @@ async def export_to_sheets(session_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error exporting to sheets: {e}")
+        logger.error("Error exporting to sheets: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/models")
 async def available_models():
-    """Get available LLM models from Ollama"""
+    """Get the Gemini models available to the configured API key"""
     try:
         models = await llm_engine.get_available_models()
         return {"models": models}
     except Exception as e:
-        logger.error(f"Error getting models: {e}")
+        logger.error("Error getting models: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+if __name__ == "__main__":
+    import sys
+    import uvicorn
+
+    # uvloop (libuv event loop) and httptools (C HTTP parser) are markedly
+    # faster than the pure-Python defaults; uvloop has no Windows build.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        # Negotiate permessage-deflate; streamed LLM text compresses well
+        ws_per_message_deflate=True,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="warning",
+        access_log=False,
+    )
@@ -4,11 +4,23 @@ Prepares audio for web frontend
 """
 
 import logging
-import base64
 from typing import Optional
 
+try:
+    # SIMD-accelerated (AVX2/SSSE3/NEON) drop-in for the stdlib base64 module
+    import pybase64 as b64
+except ImportError:
+    import base64 as b64
+
 logger = logging.getLogger(__name__)
 
+MIME_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "webm": "audio/webm"
+}
+
 
 class AudioProcessor:
     """Handle audio processing for frontend-backend communication"""
@@ -16,6 +28,10 @@ class AudioProcessor:
     def __init__(self):
         """Initialize audio processor"""
         self.supported_formats = ["wav", "mp3", "ogg", "webm"]
+        # Full data-URL prefixes, built once instead of per chunk
+        self._data_url_prefixes = {
+            fmt: f"data:{mime_type};base64," for fmt, mime_type in MIME_TYPES.items()
+        }
     
     def encode_audio_to_base64(self, audio_bytes: bytes) -> str:
         """
@@ -28,7 +44,7 @@ class AudioProcessor:
             Base64 encoded string
         """
         try:
-            return base64.b64encode(audio_bytes).decode('utf-8')
+            return b64.b64encode(audio_bytes).decode('ascii')
         except Exception as e:
             logger.error(f"Error encoding audio to base64: {e}")
             raise
@@ -44,7 +60,7 @@ class AudioProcessor:
             Raw audio bytes
         """
         try:
-            return base64.b64decode(audio_base64)
+            return b64.b64decode(audio_base64)
         except Exception as e:
             logger.error(f"Error decoding audio from base64: {e}")
             raise
@@ -60,15 +76,8 @@ class AudioProcessor:
         Returns:
             Data URL string
         """
-        mime_types = {
-            "wav": "audio/wav",
-            "mp3": "audio/mpeg",
-            "ogg": "audio/ogg",
-            "webm": "audio/webm"
-        }
-        
-        mime_type = mime_types.get(format.lower(), "audio/wav")
-        return f"data:{mime_type};base64,{audio_base64}"
+        prefix = self._data_url_prefixes.get(format.lower(), self._data_url_prefixes["wav"])
+        return prefix + audio_base64
     
     def get_supported_formats(self) -> list:
         """Get list of supported audio formats"""
@@ -3,15 +3,90 @@ Data Storage Module - Persists interview data to JSON and Google Sheets
 Stores all job descriptions and candidate responses for future improvements
 """
 
+import atexit
+import bisect
+import hashlib
 import json
 import os
 import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no cross-process file locks, so run a single worker there
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Stored and exported answers are cut to this many UTF-8 bytes
+MAX_ANSWER_BYTES = 4096
+
+# Session IDs from new_session_id(): 13 hex digits of epoch ms, then a process
+# prefix (6 hex digits, 3 in IDs issued before it was widened) and a 3 digit counter
+_TIME_SORTABLE_ID = re.compile(r"[0-9a-f]{13}(?:[0-9a-f]{6}|[0-9a-f]{3})[0-9a-f]{3}")
+
+
+def _dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize to compact (or, for human inspection, indented) UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _bounded_answer(record: Dict) -> Dict:
+    """
+    Cap a record's 'answer' at MAX_ANSWER_BYTES
+    
+    Returns the record itself when the answer fits, otherwise a copy with the
+    answer truncated plus its original length and SHA-1 for reference.
+    """
+    answer = record.get('answer') or ''
+    encoded = answer.encode('utf-8')
+    if len(encoded) <= MAX_ANSWER_BYTES:
+        return record
+    
+    return {
+        **record,
+        'answer': encoded[:MAX_ANSWER_BYTES].decode('utf-8', 'ignore'),
+        'answer_len': len(answer),
+        'answer_sha1': hashlib.sha1(encoded).hexdigest()
+    }
+
+
+def _atomic_write(path: str, data: bytes):
+    """Replace a file's contents atomically, so readers never see a partial write"""
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
 
 class DataStorage:
     def __init__(self, storage_dir: str = "interview_data"):
@@ -22,8 +97,38 @@ class DataStorage:
             storage_dir: Directory to store interview data files
         """
         self.storage_dir = storage_dir
-        self.data_file = os.path.join(storage_dir, "interviews.json")
+        # Sessions and per-event records are append-only JSON Lines files
+        self.data_file = os.path.join(storage_dir, "interviews.jsonl")
+        self.job_file = os.path.join(storage_dir, "job_descriptions.jsonl")
+        self.answers_file = os.path.join(storage_dir, "answers.jsonl")
+        # Sidecar of "<byte offset> <session_id>" lines locating each answer record
+        self.answers_index_file = os.path.join(storage_dir, "answers.idx")
         self._ensure_storage_dir()
+        self._migrate_to_jsonl(os.path.join(storage_dir, "interviews.json"), self.data_file)
+        self._migrate_to_jsonl(os.path.join(storage_dir, "job_descriptions.json"), self.job_file)
+        if self._migrate_to_jsonl(os.path.join(storage_dir, "answers.json"), self.answers_file):
+            # Migration shifts existing records, so their offsets must be rebuilt
+            if os.path.exists(self.answers_index_file):
+                os.remove(self.answers_index_file)
+        
+        # Append handles stay open for the life of the process (see _append_jsonl)
+        self._lock = threading.Lock()
+        self._handles: Dict[str, object] = {}
+        atexit.register(self.close)
+        
+        self._answer_offsets: Dict[str, List[int]] = {}
+        # Bytes of answers.idx read so far, and the last answer offset indexed
+        self._index_position = 0
+        self._last_indexed = -1
+        self._load_answer_index()
+        
+        # In-memory copy of interviews.jsonl, loaded once and kept in sync on writes
+        self._cache: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        # (start time in epoch ms, position in _cache), sorted for range queries
+        self._by_time: List[Tuple[int, int]] = []
+        self._stats: Dict = self._empty_stats()
+        self.reload()
     
     def _ensure_storage_dir(self):
         """Create storage directory if it doesn't exist"""
@@ -31,27 +136,211 @@ class DataStorage:
             os.makedirs(self.storage_dir)
             logger.info(f"Created storage directory: {self.storage_dir}")
     
-    def _load_all_interviews(self) -> List[Dict]:
-        """Load all stored interviews from JSON file"""
-        if not os.path.exists(self.data_file):
-            return []
+    def _migrate_to_jsonl(self, legacy_file: str, jsonl_file: str) -> bool:
+        """One-time conversion of a legacy JSON array file to JSON Lines; True if migrated"""
+        if not os.path.exists(legacy_file):
+            return False
+        
+        try:
+            with open(legacy_file, 'rb') as f:
+                records = _loads(f.read())
+            
+            # Legacy records predate anything already in the JSONL file
+            data = b"".join(_dumps(record) + b"\n" for record in records)
+            if os.path.exists(jsonl_file):
+                with open(jsonl_file, 'rb') as existing:
+                    data += existing.read()
+            _atomic_write(jsonl_file, data)
+            os.replace(legacy_file, legacy_file + ".migrated")
+            logger.info(f"Migrated {len(records)} records from {legacy_file} to {jsonl_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Error migrating {legacy_file} to JSON Lines: {e}")
+            return False
+    
+    def _append_jsonl(self, path: str, records: List[Dict], fsync: bool = False):
+        """Append records to a JSON Lines file, optionally fsync-ing once"""
+        lines = [_dumps(record) + b"\n" for record in records]
+        
+        with self._lock:
+            f = self._handle(path)
+            # Other workers append to the same file, so the end is only known
+            # (and the answer offsets only right) while holding its lock
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(b"".join(lines))
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+                
+                if path == self.answers_file:
+                    entries = []
+                    for record, line in zip(records, lines):
+                        entries.append((offset, record.get('session_id')))
+                        offset += len(line)
+                    self._index_answers(entries)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def _handle(self, path: str):
+        """Get the binary append handle for a file, opening it on first use"""
+        f = self._handles.get(path)
+        if f is None:
+            f = self._handles[path] = open(path, 'ab')
+            # Terminate a line torn by a crash so the next record starts cleanly
+            if f.tell() and not self._ends_with_newline(path):
+                f.write(b"\n")
+        return f
+    
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def close(self):
+        """Close the open append handles (they are reopened on the next write)"""
+        with self._lock:
+            for f in self._handles.values():
+                f.close()
+            self._handles.clear()
+    
+    def _index_answers(self, entries: List[tuple]):
+        """Append (offset, session_id) pairs to the sidecar index and load them (call with the lock held)"""
+        f = self._handle(self.answers_index_file)
+        f.write("".join(f"{offset} {session_id}\n" for offset, session_id in entries).encode('utf-8'))
+        f.flush()
+        self._sync_answer_index()
+    
+    def _sync_answer_index(self):
+        """Load sidecar entries written since the last sync, by this worker or another one"""
+        if not os.path.exists(self.answers_index_file) or \
+                os.path.getsize(self.answers_index_file) == self._index_position:
+            return
+        
+        with open(self.answers_index_file, 'rb') as f:
+            f.seek(self._index_position)
+            data = f.read()
+        # A line another worker is still writing is picked up on the next sync
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode('utf-8').splitlines():
+            offset, _, session_id = line.partition(" ")
+            # Entries are appended in file order; anything older was already indexed
+            if not session_id or int(offset) <= self._last_indexed:
+                continue
+            self._answer_offsets.setdefault(session_id, []).append(int(offset))
+            self._last_indexed = int(offset)
+        self._index_position += end
+    
+    def _load_answer_index(self):
+        """Load the answers sidecar index, indexing any records it does not cover yet"""
+        if not os.path.exists(self.answers_file):
+            with self._lock:
+                self._sync_answer_index()
+            return
+        
+        with self._lock:
+            f = self._handle(self.answers_file)
+            # Hold the answers lock so that workers starting together index the tail once
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                self._sync_answer_index()
+                entries = self._unindexed_answers()
+                if entries:
+                    self._index_answers(entries)
+                    logger.info(f"Indexed {len(entries)} answers in {self.answers_index_file}")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def _unindexed_answers(self) -> List[tuple]:
+        """(offset, session_id) of answer records after the last indexed one"""
+        entries = []
+        with open(self.answers_file, 'rb') as f:
+            if self._last_indexed >= 0:
+                f.seek(self._last_indexed)
+                f.readline()
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    try:
+                        entries.append((offset, _loads(line).get('session_id')))
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable record at offset {offset} of {self.answers_file}")
+        return entries
+    
+    def _iter_jsonl(self, path: str) -> Iterator[Dict]:
+        """Iterate over the records of a JSON Lines file"""
+        if not os.path.exists(path):
+            return
         
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    # A torn write loses only its own record, not the whole file
+                    logger.warning(f"Skipping unreadable record in {path}")
+    
+    def _load_all_interviews(self) -> List[Dict]:
+        """Load all stored interviews from the JSON Lines file"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return list(self._iter_jsonl(self.data_file))
         except Exception as e:
             logger.error(f"Error loading interviews: {e}")
             return []
     
-    def _save_all_interviews(self, interviews: List[Dict]):
-        """Save all interviews to JSON file"""
+    def reload(self):
+        """Re-read interviews.jsonl, e.g. after it was changed by another process"""
+        interviews = self._load_all_interviews()
+        by_id: Dict[str, Dict] = {}
+        stats = self._empty_stats()
+        for interview in interviews:
+            by_id.setdefault(interview.get('session_id'), interview)
+            self._add_to_stats(stats, interview)
+        by_time = sorted((self._started_ms(interview), i) for i, interview in enumerate(interviews))
+        
+        with self._lock:
+            self._cache = interviews
+            self._by_id = by_id
+            self._by_time = by_time
+            self._stats = stats
+    
+    @staticmethod
+    def _started_ms(interview: Dict) -> int:
+        """Start time of a session in epoch ms, read from its time-sortable ID when it has one"""
+        session_id = interview.get('session_id') or ''
+        if _TIME_SORTABLE_ID.fullmatch(session_id):
+            return int(session_id[:13], 16)
+        
+        # Sessions created before time-sortable IDs
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(interviews, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved {len(interviews)} interviews to {self.data_file}")
-        except Exception as e:
-            logger.error(f"Error saving interviews: {e}")
-            raise
+            stamp = interview.get('started_at') or interview.get('timestamp')
+            return int(datetime.fromisoformat(stamp).timestamp() * 1000)
+        except (TypeError, ValueError):
+            return 0
+    
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {"total_interviews": 0, "score_sum": 0.0, "score_n": 0, "total_questions": 0}
+    
+    @staticmethod
+    def _add_to_stats(stats: Dict, interview: Dict):
+        """Fold one interview into the running totals behind get_statistics()"""
+        stats["total_interviews"] += 1
+        if 'average_score' in interview:
+            stats["score_sum"] += interview['average_score']
+            stats["score_n"] += 1
+        stats["total_questions"] += len(interview.get('questions_and_answers', []))
     
     def save_interview_session(self, session_data: Dict):
         """
@@ -68,18 +357,8 @@ class DataStorage:
                 - timestamp
         """
         try:
-            # Load existing interviews
-            interviews = self._load_all_interviews()
-            
-            # Add timestamp if not present
-            if 'timestamp' not in session_data:
-                session_data['timestamp'] = datetime.now().isoformat()
-            
-            # Append new session
-            interviews.append(session_data)
-            
-            # Save back to file
-            self._save_all_interviews(interviews)
+            record = self._remember_interview(session_data)
+            self._append_jsonl(self.data_file, [record])
             
             logger.info(f"Saved interview session: {session_data.get('session_id')}")
             
@@ -87,43 +366,65 @@ class DataStorage:
             logger.error(f"Error saving interview session: {e}")
             raise
     
-    def save_job_description(self, job_description: str, session_id: str):
+    def _remember_interview(self, session_data: Dict) -> Dict:
+        """Add a session to the in-memory index (without writing to disk); returns the stored record"""
+        # Add timestamp if not present
+        if 'timestamp' not in session_data:
+            session_data['timestamp'] = datetime.now().isoformat()
+        
+        # Bound answer sizes on a copy, leaving the caller's report intact
+        questions_and_answers = session_data.get('questions_and_answers') or []
+        bounded = [_bounded_answer(qa) for qa in questions_and_answers]
+        if any(b is not qa for b, qa in zip(bounded, questions_and_answers)):
+            session_data = {**session_data, 'questions_and_answers': bounded}
+        
+        with self._lock:
+            bisect.insort(self._by_time, (self._started_ms(session_data), len(self._cache)))
+            self._cache.append(session_data)
+            self._by_id.setdefault(session_data.get('session_id'), session_data)
+            self._add_to_stats(self._stats, session_data)
+        return session_data
+    
+    @staticmethod
+    def _job_record(job_description: str, session_id: str, timestamp: Optional[str] = None) -> Dict:
+        return {
+            "session_id": session_id,
+            "job_description": job_description,
+            "timestamp": timestamp or datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _answer_record(
+        session_id: str, question: str, answer: str, score: float, timestamp: Optional[str] = None
+    ) -> Dict:
+        return _bounded_answer({
+            "session_id": session_id,
+            "question": question,
+            "answer": answer,
+            "score": score,
+            "timestamp": timestamp or datetime.now().isoformat()
+        })
+    
+    def save_job_description(self, job_description: str, session_id: str, timestamp: Optional[str] = None):
         """
         Save job description separately for analysis
         
         Args:
             job_description: The job posting text
             session_id: Interview session ID
+            timestamp: ISO timestamp of the submission (defaults to now)
         """
         try:
-            job_data = {
-                "session_id": session_id,
-                "job_description": job_description,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            job_file = os.path.join(self.storage_dir, "job_descriptions.json")
-            
-            # Load existing jobs
-            if os.path.exists(job_file):
-                with open(job_file, 'r', encoding='utf-8') as f:
-                    jobs = json.load(f)
-            else:
-                jobs = []
-            
-            # Append new job
-            jobs.append(job_data)
-            
-            # Save back
-            with open(job_file, 'w', encoding='utf-8') as f:
-                json.dump(jobs, f, indent=2, ensure_ascii=False)
+            self._append_jsonl(self.job_file, [self._job_record(job_description, session_id, timestamp)])
             
             logger.info(f"Saved job description for session: {session_id}")
             
         except Exception as e:
             logger.error(f"Error saving job description: {e}")
     
-    def save_answer(self, session_id: str, question: str, answer: str, score: float):
+    def save_answer(
+        self, session_id: str, question: str, answer: str, score: float, timestamp: Optional[str] = None
+    ):
         """
         Save individual answer (called incrementally during interview)
         
@@ -132,75 +433,373 @@ class DataStorage:
             question: The question asked
             answer: Candidate's answer
             score: Score for the answer
+            timestamp: ISO timestamp of the answer (defaults to now)
         """
         try:
-            answer_data = {
-                "session_id": session_id,
-                "question": question,
-                "answer": answer,
-                "score": score,
-                "timestamp": datetime.now().isoformat()
-            }
+            self._append_jsonl(
+                self.answers_file,
+                [self._answer_record(session_id, question, answer, score, timestamp)]
+            )
+            
+            logger.info(f"Saved answer for session: {session_id}")
+            
+        except Exception as e:
+            logger.error(f"Error saving answer: {e}")
+    
+    def get_all_interviews(self) -> List[Dict]:
+        """Get all stored interviews"""
+        return list(self._cache)
+    
+    def export_interviews(self, path: Optional[str] = None) -> str:
+        """
+        Write all interviews as an indented JSON array for human inspection
+        
+        Args:
+            path: Output file (default: interviews.pretty.json in the storage directory)
             
-            answers_file = os.path.join(self.storage_dir, "answers.json")
+        Returns:
+            Path of the written file
+        """
+        path = path or os.path.join(self.storage_dir, "interviews.pretty.json")
+        _atomic_write(path, _dumps(self.get_all_interviews(), pretty=True))
+        logger.info(f"Exported interviews to {path}")
+        return path
+    
+    def get_all_job_descriptions(self) -> List[Dict]:
+        """Get all stored job descriptions"""
+        return list(self._iter_jsonl(self.job_file))
+    
+    def get_all_answers(self, session_id: Optional[str] = None) -> List[Dict]:
+        """Get stored answers, optionally only those of one session"""
+        if session_id is None:
+            return list(self._iter_jsonl(self.answers_file))
+        
+        with self._lock:
+            self._sync_answer_index()
+            offsets = list(self._answer_offsets.get(session_id, ()))
+        if not offsets:
+            return []
+        
+        answers = []
+        with open(self.answers_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                answers.append(_loads(f.readline()))
+        return answers
+    
+    def get_interview_by_id(self, session_id: str) -> Optional[Dict]:
+        """Get a specific interview by session ID"""
+        return self._by_id.get(session_id)
+    
+    def get_interviews_between(self, start: float, end: float) -> List[Dict]:
+        """
+        Get interviews started within a time range
+        
+        Args:
+            start: Range start (epoch seconds, inclusive)
+            end: Range end (epoch seconds, inclusive)
+        """
+        with self._lock:
+            lo = bisect.bisect_left(self._by_time, (int(start * 1000), -1))
+            hi = bisect.bisect_right(self._by_time, (int(end * 1000), len(self._cache)))
+            return [self._cache[i] for _, i in self._by_time[lo:hi]]
+    
+    def get_statistics(self) -> Dict:
+        """Get statistics about stored interviews"""
+        stats = self._stats
+        
+        return {
+            "total_interviews": stats["total_interviews"],
+            "average_score": stats["score_sum"] / stats["score_n"] if stats["score_n"] else 0,
+            "total_questions": stats["total_questions"],
+            "total_answers": stats["total_questions"]
+        }
+
+
+class AsyncDataStorage:
+    """
+    Write-behind wrapper around DataStorage
+    Queues writes for a background thread that appends them in batches,
+    with one fsync per file per batch, keeping disk I/O off the request path
+    """
+    
+    BATCH_SIZE = 64
+    FLUSH_INTERVAL = 0.1  # seconds
+    
+    _STOP = object()
+    
+    def __init__(self, storage: DataStorage):
+        """
+        Initialize write-behind storage
+        
+        Args:
+            storage: DataStorage that performs the actual writes (and serves reads)
+        """
+        self.storage = storage
+        self.q: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, name="data-storage-writer", daemon=True)
+        self._thread.start()
+    
+    def __getattr__(self, name):
+        # Reads (get_all_interviews, get_statistics, ...) go straight to the wrapped storage
+        return getattr(self.storage, name)
+    
+    def save_interview_session(self, session_data: Dict):
+        """Index a complete interview session now and persist it in the background"""
+        record = self.storage._remember_interview(session_data)
+        self.q.put((self.storage.data_file, record))
+    
+    def save_job_description(self, job_description: str, session_id: str, timestamp: Optional[str] = None):
+        """Queue a job description for saving"""
+        self.q.put((
+            self.storage.job_file,
+            DataStorage._job_record(job_description, session_id, timestamp)
+        ))
+    
+    def save_answer(
+        self, session_id: str, question: str, answer: str, score: float, timestamp: Optional[str] = None
+    ):
+        """Queue an individual answer for saving"""
+        self.q.put((
+            self.storage.answers_file,
+            DataStorage._answer_record(session_id, question, answer, score, timestamp)
+        ))
+    
+    def flush(self):
+        """Block until every queued write has been written"""
+        self.q.join()
+    
+    def close(self):
+        """Write any queued records and stop the writer thread"""
+        self.q.put((self._STOP, None))
+        self._thread.join()
+        self.storage.close()
+    
+    def _drain(self):
+        """Writer thread: collect up to BATCH_SIZE items or FLUSH_INTERVAL, then write"""
+        while True:
+            batch = [self.q.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.q.get(timeout=remaining))
+                except queue.Empty:
+                    break
             
-            # Load existing answers
-            if os.path.exists(answers_file):
-                with open(answers_file, 'r', encoding='utf-8') as f:
-                    answers = json.load(f)
+            stop = self._write_batch(batch)
+            for _ in batch:
+                self.q.task_done()
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[tuple]) -> bool:
+        """Write one batch; returns True if it contained the stop sentinel"""
+        stop = False
+        records_by_file: Dict[str, List[Dict]] = {}
+        
+        for target, record in batch:
+            if target is self._STOP:
+                stop = True
             else:
-                answers = []
+                records_by_file.setdefault(target, []).append(record)
+        
+        for path, records in records_by_file.items():
+            try:
+                self.storage._append_jsonl(path, records, fsync=True)
+                logger.info(f"Saved {len(records)} records to {path}")
+            except Exception as e:
+                logger.error(f"Error saving records to {path}: {e}")
+        
+        return stop
+
+
+class SQLiteDataStorage:
+    """
+    DataStorage backed by a single SQLite database (WAL mode)
+    Sessions, job descriptions and answers are rows keyed by session_id, so
+    lookups are indexed and saves are single inserts
+    """
+    
+    def __init__(self, storage_dir: str = "interview_data"):
+        """
+        Initialize SQLite storage
+        
+        Args:
+            storage_dir: Directory holding interviews.db (existing JSON Lines data is imported once)
+        """
+        self.storage_dir = storage_dir
+        self.db_file = os.path.join(storage_dir, "interviews.db")
+        os.makedirs(storage_dir, exist_ok=True)
+        
+        # One connection shared by the worker threads storage calls run on
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        
+        is_new = not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='interviews'"
+        ).fetchone()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS interviews (
+                session_id TEXT PRIMARY KEY,
+                started_ms INTEGER,
+                average_score REAL,
+                total_questions INTEGER,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS interviews_started ON interviews(started_ms);
+            CREATE TABLE IF NOT EXISTS job_descriptions (session_id TEXT, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS answers (session_id TEXT, data TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS answers_session ON answers(session_id);
+        """)
+        if is_new:
+            self._import_jsonl()
+    
+    def _import_jsonl(self):
+        """Copy data saved by the JSON Lines DataStorage into a new database"""
+        if not os.path.exists(os.path.join(self.storage_dir, "interviews.jsonl")) and \
+                not os.path.exists(os.path.join(self.storage_dir, "answers.jsonl")):
+            return
+        
+        legacy = DataStorage(self.storage_dir)
+        interviews = legacy.get_all_interviews()
+        job_descriptions = legacy.get_all_job_descriptions()
+        answers = legacy.get_all_answers()
+        legacy.close()
+        
+        with self._lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO interviews VALUES (?, ?, ?, ?, ?)",
+                [self._interview_row(interview) for interview in interviews]
+            )
+            self.conn.executemany(
+                "INSERT INTO job_descriptions VALUES (?, ?)",
+                [(record.get('session_id'), _dumps(record).decode('utf-8')) for record in job_descriptions]
+            )
+            self.conn.executemany(
+                "INSERT INTO answers VALUES (?, ?)",
+                [(record.get('session_id'), _dumps(record).decode('utf-8')) for record in answers]
+            )
+            self.conn.execute("COMMIT")
+        logger.info(f"Imported {len(interviews)} interviews and {len(answers)} answers into {self.db_file}")
+    
+    @staticmethod
+    def _interview_row(session_data: Dict) -> tuple:
+        return (
+            session_data.get('session_id'),
+            DataStorage._started_ms(session_data),
+            session_data.get('average_score'),
+            len(session_data.get('questions_and_answers', [])),
+            _dumps(session_data).decode('utf-8')
+        )
+    
+    def _insert(self, table: str, record: Dict):
+        with self._lock:
+            self.conn.execute(
+                f"INSERT INTO {table} VALUES (?, ?)",
+                (record.get('session_id'), _dumps(record).decode('utf-8'))
+            )
+    
+    def _select(self, query: str, params: tuple = ()) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [_loads(data) for data, in rows]
+    
+    def save_interview_session(self, session_data: Dict):
+        """Save a complete interview session (see DataStorage.save_interview_session)"""
+        try:
+            if 'timestamp' not in session_data:
+                session_data['timestamp'] = datetime.now().isoformat()
             
-            # Append new answer
-            answers.append(answer_data)
+            questions_and_answers = session_data.get('questions_and_answers') or []
+            record = {**session_data, 'questions_and_answers': [_bounded_answer(qa) for qa in questions_and_answers]}
             
-            # Save back
-            with open(answers_file, 'w', encoding='utf-8') as f:
-                json.dump(answers, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO interviews VALUES (?, ?, ?, ?, ?)",
+                    self._interview_row(record)
+                )
             
-            logger.info(f"Saved answer for session: {session_id}")
+            logger.info(f"Saved interview session: {session_data.get('session_id')}")
             
+        except Exception as e:
+            logger.error(f"Error saving interview session: {e}")
+            raise
+    
+    def save_job_description(self, job_description: str, session_id: str, timestamp: Optional[str] = None):
+        """Save job description separately for analysis"""
+        try:
+            self._insert("job_descriptions", DataStorage._job_record(job_description, session_id, timestamp))
+            logger.info(f"Saved job description for session: {session_id}")
+        except Exception as e:
+            logger.error(f"Error saving job description: {e}")
+    
+    def save_answer(
+        self, session_id: str, question: str, answer: str, score: float, timestamp: Optional[str] = None
+    ):
+        """Save individual answer (called incrementally during interview)"""
+        try:
+            self._insert("answers", DataStorage._answer_record(session_id, question, answer, score, timestamp))
+            logger.info(f"Saved answer for session: {session_id}")
         except Exception as e:
             logger.error(f"Error saving answer: {e}")
     
     def get_all_interviews(self) -> List[Dict]:
         """Get all stored interviews"""
-        return self._load_all_interviews()
+        return self._select("SELECT data FROM interviews ORDER BY rowid")
+    
+    def get_all_job_descriptions(self) -> List[Dict]:
+        """Get all stored job descriptions"""
+        return self._select("SELECT data FROM job_descriptions ORDER BY rowid")
+    
+    def get_all_answers(self, session_id: Optional[str] = None) -> List[Dict]:
+        """Get stored answers, optionally only those of one session"""
+        if session_id is None:
+            return self._select("SELECT data FROM answers ORDER BY rowid")
+        return self._select("SELECT data FROM answers WHERE session_id = ? ORDER BY rowid", (session_id,))
     
     def get_interview_by_id(self, session_id: str) -> Optional[Dict]:
         """Get a specific interview by session ID"""
-        interviews = self._load_all_interviews()
-        for interview in interviews:
-            if interview.get('session_id') == session_id:
-                return interview
-        return None
+        rows = self._select("SELECT data FROM interviews WHERE session_id = ?", (session_id,))
+        return rows[0] if rows else None
+    
+    def get_interviews_between(self, start: float, end: float) -> List[Dict]:
+        """Get interviews started within a time range (epoch seconds, inclusive)"""
+        return self._select(
+            "SELECT data FROM interviews WHERE started_ms BETWEEN ? AND ? ORDER BY started_ms",
+            (int(start * 1000), int(end * 1000))
+        )
     
     def get_statistics(self) -> Dict:
         """Get statistics about stored interviews"""
-        interviews = self._load_all_interviews()
-        
-        if not interviews:
-            return {
-                "total_interviews": 0,
-                "average_score": 0,
-                "total_questions": 0,
-                "total_answers": 0
-            }
-        
-        total_scores = []
-        total_questions = 0
-        
-        for interview in interviews:
-            if 'average_score' in interview:
-                total_scores.append(interview['average_score'])
-            total_questions += len(interview.get('questions_and_answers', []))
+        with self._lock:
+            total, average, questions = self.conn.execute(
+                "SELECT COUNT(*), AVG(average_score), SUM(total_questions) FROM interviews"
+            ).fetchone()
         
         return {
-            "total_interviews": len(interviews),
-            "average_score": sum(total_scores) / len(total_scores) if total_scores else 0,
-            "total_questions": total_questions,
-            "total_answers": total_questions
+            "total_interviews": total,
+            "average_score": average or 0,
+            "total_questions": questions or 0,
+            "total_answers": questions or 0
         }
+    
+    def export_interviews(self, path: Optional[str] = None) -> str:
+        """Write all interviews as an indented JSON array for human inspection"""
+        path = path or os.path.join(self.storage_dir, "interviews.pretty.json")
+        _atomic_write(path, _dumps(self.get_all_interviews(), pretty=True))
+        logger.info(f"Exported interviews to {path}")
+        return path
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
 
 
 class GoogleSheetsStorage:
@@ -209,6 +808,11 @@ class GoogleSheetsStorage:
     Requires Google Sheets API credentials
     """
     
+    HEADERS = [
+        "Session ID", "Timestamp", "Candidate Name", "Experience Years",
+        "Average Score", "Job Description", "Questions", "Answers", "Scores"
+    ]
+    
     def __init__(self, credentials_file: Optional[str] = None):
         """
         Initialize Google Sheets storage
@@ -218,14 +822,14 @@ class GoogleSheetsStorage:
         """
         self.credentials_file = credentials_file or os.getenv("GOOGLE_SHEETS_CREDENTIALS")
         self.sheet = None
-        self._initialized = False
+        self.client = None
+        self._worksheets: Dict[str, object] = {}
+        self._headers_written: set = set()
+        self._client_lock = threading.Lock()
         
-        # Try to initialize if credentials are available
-        if self.credentials_file and os.path.exists(self.credentials_file):
-            try:
-                self._initialize()
-            except Exception as e:
-                logger.warning(f"Could not initialize Google Sheets: {e}")
+        # gspread and google-auth are slow to import, so the connection is
+        # only opened on the first export
+        self._initialized = bool(self.credentials_file and os.path.exists(self.credentials_file))
     
     def _initialize(self):
         """Initialize Google Sheets API connection"""
@@ -247,20 +851,94 @@ class GoogleSheetsStorage:
             
             # Authorize and connect
             self.client = gspread.authorize(creds)
-            self._initialized = True
             
             logger.info("Google Sheets initialized successfully")
             
         except ImportError:
             logger.warning("gspread not installed. Run: pip install gspread google-auth")
+            self._initialized = False
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets: {e}")
             raise
     
     def is_initialized(self) -> bool:
-        """Check if Google Sheets is ready"""
+        """Check if Google Sheets is configured (the connection opens on first export)"""
         return self._initialized
     
+    def _ensure_client(self) -> bool:
+        """Open the Google Sheets connection if it is not open yet"""
+        with self._client_lock:
+            if self.client is None:
+                try:
+                    self._initialize()
+                except Exception as e:
+                    logger.warning(f"Could not initialize Google Sheets: {e}")
+        return self.client is not None
+    
+    def _get_worksheet(self, sheet_name: str):
+        """Open (or create) the Interviews worksheet once and cache the handle"""
+        worksheet = self._worksheets.get(sheet_name)
+        if worksheet is not None:
+            return worksheet
+        
+        import gspread
+        
+        # Try to open existing sheet or create new one
+        try:
+            sheet = self.client.open(sheet_name)
+        except gspread.exceptions.SpreadsheetNotFound:
+            sheet = self.client.create(sheet_name)
+            logger.info(f"Created new Google Sheet: {sheet_name}")
+        
+        # Get or create worksheet
+        try:
+            worksheet = sheet.worksheet("Interviews")
+        except gspread.exceptions.WorksheetNotFound:
+            worksheet = sheet.add_worksheet(title="Interviews", rows=1000, cols=20)
+        
+        self._worksheets[sheet_name] = worksheet
+        return worksheet
+    
+    def _append_rows(self, sheet_name: str, rows: List[List[str]]):
+        """Append rows in a single request, led by the header row if the sheet has none yet"""
+        worksheet = self._get_worksheet(sheet_name)
+        
+        # Check if headers exist (once per sheet per process, even if the handle
+        # is reopened after an error); if not, send them with the data
+        if sheet_name not in self._headers_written:
+            if worksheet.row_count == 0 or not worksheet.row_values(1):
+                rows = [self.HEADERS] + rows
+        
+        worksheet.append_rows(rows, value_input_option='RAW', insert_data_option='INSERT_ROWS')
+        self._headers_written.add(sheet_name)
+    
+    @staticmethod
+    def _row_for(interview_data: Dict) -> List[str]:
+        """Build the worksheet row for one interview"""
+        # Note: Job descriptions are truncated to 500 chars for Google Sheets
+        # to avoid cell size limits and improve readability. Full descriptions
+        # are still available in the local JSON storage.
+        questions, answers = [], []
+        for qa in interview_data.get('questions_and_answers', []):
+            questions.append(qa['question'])
+            answers.append(_bounded_answer(qa)['answer'])
+        
+        return [
+            interview_data.get('session_id', ''),
+            interview_data.get('timestamp', datetime.now().isoformat()),
+            interview_data.get('candidate_name', ''),
+            str(interview_data.get('candidate_experience', 0)),
+            str(interview_data.get('average_score', 0)),
+            interview_data.get('job_description', '')[:500],  # Truncate long descriptions
+            _dumps(questions).decode('utf-8'),
+            _dumps(answers).decode('utf-8'),
+            # Whole-number scores are written as 7 rather than 7.0
+            _dumps([
+                int(score) if isinstance(score, float) and score.is_integer() else score
+                for score in interview_data.get('individual_scores', [])
+            ]).decode('utf-8')
+        ]
+    
     def export_interview(self, interview_data: Dict, sheet_name: str = "Interview Data"):
         """
         Export interview data to Google Sheets
@@ -269,67 +947,40 @@ class GoogleSheetsStorage:
             interview_data: Complete interview data dictionary
             sheet_name: Name of the Google Sheet to create/update
         """
-        if not self._initialized:
+        if not self._initialized or not self._ensure_client():
             logger.warning("Google Sheets not initialized. Skipping export.")
             return
         
         try:
-            import gspread
-            
-            # Try to open existing sheet or create new one
-            try:
-                sheet = self.client.open(sheet_name)
-            except gspread.exceptions.SpreadsheetNotFound:
-                sheet = self.client.create(sheet_name)
-                logger.info(f"Created new Google Sheet: {sheet_name}")
-            
-            # Get or create worksheet
-            try:
-                worksheet = sheet.worksheet("Interviews")
-            except gspread.exceptions.WorksheetNotFound:
-                worksheet = sheet.add_worksheet(title="Interviews", rows=1000, cols=20)
-            
-            # Prepare data for export
-            headers = [
-                "Session ID", "Timestamp", "Candidate Name", "Experience Years",
-                "Average Score", "Job Description", "Questions", "Answers", "Scores"
-            ]
-            
-            # Check if headers exist, if not add them
-            if worksheet.row_count == 0 or not worksheet.row_values(1):
-                worksheet.append_row(headers)
-            
-            # Prepare row data
-            # Note: Job descriptions are truncated to 500 chars for Google Sheets
-            # to avoid cell size limits and improve readability. Full descriptions
-            # are still available in the local JSON storage.
-            row = [
-                interview_data.get('session_id', ''),
-                interview_data.get('timestamp', datetime.now().isoformat()),
-                interview_data.get('candidate_name', ''),
-                str(interview_data.get('candidate_experience', 0)),
-                str(interview_data.get('average_score', 0)),
-                interview_data.get('job_description', '')[:500],  # Truncate long descriptions
-                json.dumps([qa['question'] for qa in interview_data.get('questions_and_answers', [])]),
-                json.dumps([qa['answer'] for qa in interview_data.get('questions_and_answers', [])]),
-                json.dumps(interview_data.get('individual_scores', []))
-            ]
-            
-            # Append row
-            worksheet.append_row(row)
+            self._append_rows(sheet_name, [self._row_for(interview_data)])
             
             logger.info(f"Exported interview {interview_data.get('session_id')} to Google Sheets")
             
         except Exception as e:
+            # Drop the cached handle in case the sheet was deleted or renamed
+            self._worksheets.pop(sheet_name, None)
             logger.error(f"Error exporting to Google Sheets: {e}")
     
     def export_all_interviews(self, interviews: List[Dict], sheet_name: str = "Interview Data"):
         """
-        Export all interviews to Google Sheets
+        Export all interviews to Google Sheets in a single request
         
         Args:
             interviews: List of interview data dictionaries
             sheet_name: Name of the Google Sheet
         """
-        for interview in interviews:
-            self.export_interview(interview, sheet_name)
+        if not interviews:
+            return
+        
+        if not self._initialized or not self._ensure_client():
+            logger.warning("Google Sheets not initialized. Skipping export.")
+            return
+        
+        try:
+            self._append_rows(sheet_name, [self._row_for(interview) for interview in interviews])
+            
+            logger.info(f"Exported {len(interviews)} interviews to Google Sheets")
+            
+        except Exception as e:
+            self._worksheets.pop(sheet_name, None)
+            logger.error(f"Error exporting to Google Sheets: {e}")
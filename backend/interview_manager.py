@@ -2,17 +2,107 @@
 Interview Manager - Orchestrates the interview flow
 Manages questions, answers, scoring, and state
 """
-import uuid
+import asyncio
+import bisect
+import itertools
 import json
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Set
+from datetime import datetime, timezone
+from enum import IntEnum
 from data_storage import DataStorage, GoogleSheetsStorage
 
 logger = logging.getLogger(__name__)
 
+# Hire recommendation by average score: below 5 "no", from 5 "maybe", from 6 "yes", from 7 "strong yes"
+HIRE_THRESHOLDS = (5.0, 6.0, 7.0)
+HIRE_LABELS = ("no", "maybe", "yes", "strong yes")
+
+# Process-wide cap on in-flight Gemini calls across all interviews; each call takes a
+# slot only for its own duration, so bursts queue here instead of tripping API rate limits
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+_LLM_SEMAPHORE = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+# Slots currently held, counted here rather than read off the semaphore's internals
+_llm_in_use = 0
+
+# Strong references to in-flight storage/export tasks (the event loop only keeps weak ones),
+# so they survive their InterviewManager being dropped from the session store
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def drain_background_tasks():
+    """Wait for every in-flight storage/export task (call before shutdown)"""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
+class InterviewState(IntEnum):
+    """Where an interview is in its question/answer cycle"""
+    READY = 0            # created, first question not asked yet
+    AWAITING_ANSWER = 1  # a question is out, waiting for the candidate
+    EVALUATING = 2       # answer accepted; its evaluation / the next question is in flight
+    COMPLETE = 3         # ended, report generated or being generated
+
+
+def llm_slots_available() -> int:
+    """Number of free LLM call slots (LLM_MAX_CONCURRENCY when idle)"""
+    return LLM_MAX_CONCURRENCY - _llm_in_use
+
+
+@asynccontextmanager
+async def _llm_slot():
+    """Hold one slot of the shared LLM semaphore"""
+    global _llm_in_use
+    async with _LLM_SEMAPHORE:
+        _llm_in_use += 1
+        try:
+            yield
+        finally:
+            _llm_in_use -= 1
+
+
+async def _limited(coro):
+    """Await an LLM call while holding one slot of the shared semaphore"""
+    async with _llm_slot():
+        return await coro
+
+
+# Random per-process prefix, and a counter starting at a random value, so
+# workers sharing a session store do not issue IDs in step. Drawn once rather
+# than reading os.urandom for every interview
+_SESSION_ID_PREFIX = f"{secrets.randbits(24):06x}"
+_session_counter = itertools.count(secrets.randbits(12))
+
+
+def new_session_id() -> str:
+    """
+    Time-sortable session ID: 13 hex digits of epoch milliseconds, a 6 hex digit
+    process prefix and a 3 hex digit per-process counter
+
+    IDs from one process are unique unless it starts more than 4096 interviews in
+    one millisecond. Two processes can collide only if they drew the same 24-bit
+    prefix (about 1 in 16.7 million per pair) and start interviews in the same
+    millisecond with matching counter values.
+    """
+    return f"{int(time.time() * 1000):013x}{_SESSION_ID_PREFIX}{next(_session_counter) & 0xfff:03x}"
+
 
 class InterviewManager:
+    # Fixed attribute layout: no per-instance __dict__ across many concurrent interviews
+    __slots__ = (
+        "llm_engine", "session_id", "job_description", "candidate_name",
+        "experience_years", "difficulty", "candidate_profile",
+        "data_storage", "google_sheets", "google_sheet_name", "cached_content",
+        "current_question_number", "total_questions", "questions_asked",
+        "answers_given", "scores", "_score_sum", "evaluations",
+        "state", "started_at", "ended_at",
+        "_started_monotonic", "duration_seconds", "_pending", "_evaluation_task"
+    )
+    
     def __init__(
         self,
         llm_engine,
@@ -28,7 +118,9 @@ class InterviewManager:
         Initialize interview manager
         
         Args:
-            llm_engine: LLMEngine instance
+            llm_engine: LLMEngine instance; a long-lived engine shared by all interviews,
+                so its Gemini connection and response caches are reused (never
+                create one per interview)
             job_description: Job description text
             candidate_name: Name of candidate
             experience_years: Years of experience
@@ -37,68 +129,275 @@ class InterviewManager:
             google_sheets: GoogleSheetsStorage instance for exporting to Google Sheets
         """
         self.llm_engine = llm_engine
-        self.session_id = str(uuid.uuid4())[:8]
+        self.session_id = new_session_id()
         self.job_description = job_description
         self.candidate_name = candidate_name
         self.experience_years = experience_years
         self.difficulty = difficulty
         
+        # Static candidate details passed with every LLM call, built once
+        self.candidate_profile = {
+            "name": candidate_name,
+            "experience_years": experience_years,
+            "difficulty": difficulty
+        }
+        
         # Data persistence
         self.data_storage = data_storage
         self.google_sheets = google_sheets
         self.google_sheet_name = google_sheet_name
         
+        # Name of the Gemini cached context holding the static interview preamble
+        self.cached_content: Optional[str] = None
+        
         # Interview state
         self.current_question_number = 0
         self.total_questions = 5
         self.questions_asked: List[str] = []
         self.answers_given: List[str] = []
         self.scores: List[float] = []
+        self._score_sum = 0.0  # running total of self.scores
         self.evaluations: List[Dict] = []
-        self.interview_started = False
-        self.interview_ended = False
+        self.state = InterviewState.READY
         self.started_at = None
         self.ended_at = None
+        # Monotonic clock readings for the duration (only valid within this process)
+        self._started_monotonic: Optional[float] = None
+        self.duration_seconds: Optional[float] = None
         
-        # Save job description to storage
-        if self.data_storage:
-            try:
-                self.data_storage.save_job_description(job_description, self.session_id)
-            except Exception as e:
-                logger.error(f"Error saving job description: {e}")
+        # Storage/export tasks started by this interview that have not finished yet
+        self._pending: Set[asyncio.Task] = set()
+        # Scoring of the last streamed turn's answer, left running after the next question is sent
+        self._evaluation_task: Optional[asyncio.Task] = None
+    
+    @property
+    def interview_started(self) -> bool:
+        """Whether the first question has been asked"""
+        return self.state is not InterviewState.READY
+    
+    @property
+    def interview_ended(self) -> bool:
+        """Whether the interview has ended"""
+        return self.state is InterviewState.COMPLETE
+    
+    @staticmethod
+    def timestamp_from_session_id(session_id: str) -> float:
+        """Get the creation time (epoch seconds) encoded in a session ID"""
+        return int(session_id[:13], 16) / 1000
     
     async def generate_first_question(self) -> str:
         """Generate the first interview question"""
         try:
-            candidate_profile = {
-                "name": self.candidate_name,
-                "experience_years": self.experience_years,
-                "difficulty": self.difficulty
-            }
-            
-            self.interview_started = True
-            self.started_at = datetime.now()
+            self.started_at = datetime.now(timezone.utc)
+            self._started_monotonic = time.monotonic()
             self.current_question_number = 1
             
+            # Save job description to storage (off the event loop, without waiting)
+            if self.data_storage:
+                self._run_in_background(
+                    "saving job description",
+                    self.data_storage.save_job_description,
+                    self.job_description,
+                    self.session_id,
+                    self.started_at.isoformat()
+                )
+            
             # Generate first question using LLM
-            question = await self.llm_engine.generate_question(
+            question = await _limited(self.llm_engine.generate_question(
                 job_description=self.job_description,
-                candidate_profile=candidate_profile,
+                candidate_profile=self.candidate_profile,
                 previous_questions=[],
                 question_number=1,
-                total_questions=self.total_questions
-            )
+                total_questions=self.total_questions,
+                cached_content=self.cached_content
+            ))
             
             self.questions_asked.append(question)
+            self.state = InterviewState.AWAITING_ANSWER
             
-            logger.info(f"Interview {self.session_id} started for {self.candidate_name}")
+            logger.info("Interview %s started for %s", self.session_id, self.candidate_name)
             
             return question
             
         except Exception as e:
-            logger.error(f"Error generating first question: {e}")
+            logger.error("Error generating first question: %s", e)
             raise
     
+    def _accept_answer(self, answer: str) -> str:
+        """Validate and store an answer; returns the question it answers"""
+        if self.state is InterviewState.READY:
+            raise ValueError("Interview not started")
+        
+        if self.state is InterviewState.COMPLETE:
+            raise ValueError("Interview already ended")
+        
+        if self.state is InterviewState.EVALUATING:
+            # The last attempt at this turn failed part-way. Resubmitting the same
+            # answer resumes it (keeping its evaluation if that finished); a
+            # different answer replaces it
+            if self.answers_given[-1] == answer:
+                return self.questions_asked[-1]
+            self._discard_turn()
+        
+        # Store the answer
+        self.answers_given.append(answer)
+        self.state = InterviewState.EVALUATING
+        
+        # The question being answered is always the last one asked
+        return self.questions_asked[-1]
+    
+    def _discard_turn(self):
+        """Drop the answer (and any evaluation) of an interrupted turn"""
+        answered = len(self.questions_asked) - 1
+        del self.answers_given[answered:]
+        del self.evaluations[answered:]
+        del self.scores[answered:]
+        self._score_sum = sum(self.scores)
+    
+    async def _evaluate_answer(self, question_number: int, current_question: str, answer: str) -> Dict:
+        """Evaluate and store an accepted answer; returns its evaluation"""
+        if len(self.evaluations) >= question_number:
+            # Already evaluated by an interrupted attempt at this turn
+            return self.evaluations[question_number - 1]
+        
+        answered_at = datetime.now(timezone.utc).isoformat()
+        
+        # Evaluate the answer using LLM
+        evaluation = await _limited(self.llm_engine.evaluate_answer(
+            question=current_question,
+            answer=answer,
+            job_description=self.job_description,
+            candidate_profile=self.candidate_profile,
+            cached_content=self.cached_content
+        ))
+        
+        self._record_evaluation(question_number, current_question, answer, evaluation, answered_at)
+        return evaluation
+    
+    def _record_evaluation(
+        self, question_number: int, current_question: str, answer: str,
+        evaluation: Dict, answered_at: str
+    ):
+        """Store an answer's evaluation and persist the answer"""
+        # Store evaluation and score
+        self._store_evaluation(evaluation)
+        
+        # Save answer to storage
+        if self.data_storage:
+            self._run_in_background(
+                "saving answer",
+                self.data_storage.save_answer,
+                session_id=self.session_id,
+                question=current_question,
+                answer=answer,
+                score=evaluation.get("score", 0),
+                timestamp=answered_at
+            )
+        
+        logger.info(
+            "Answer %d/%d scored %.1f/10",
+            question_number, self.total_questions, evaluation.get('score', 0)
+        )
+    
+    async def _evaluate_in_background(
+        self, question_number: int, current_question: str, answer: str
+    ) -> Optional[Dict]:
+        """_evaluate_answer for a background task: a failure leaves the answer for the report to score"""
+        try:
+            return await self._evaluate_answer(question_number, current_question, answer)
+        except Exception as e:
+            logger.error("Error evaluating answer %d: %s", question_number, e)
+            return None
+    
+    def _run_in_background(self, action: str, func, *args, **kwargs):
+        """Run a blocking storage/export call on a worker thread without awaiting it"""
+        async def run():
+            try:
+                await asyncio.to_thread(func, *args, **kwargs)
+            except Exception as e:
+                logger.error("Error %s: %s", action, e)
+        
+        task = asyncio.create_task(run())
+        for tasks in (_background_tasks, self._pending):
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    
+    async def aclose(self):
+        """
+        Wait for this interview's storage/export calls to finish (graceful shutdown)
+        
+        The shared llm_engine is left open for the other interviews.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+    
+    def _store_evaluation(self, evaluation: Dict):
+        """Record an answer's evaluation and score"""
+        score = evaluation.get("score", 0)
+        self.scores.append(score)
+        self._score_sum += score
+        self.evaluations.append(evaluation)
+    
+    def _average_score(self) -> float:
+        """Average score so far, from the running total"""
+        return self._score_sum / len(self.scores) if self.scores else 0
+    
+    def _end(self):
+        """Mark the interview as ended and record its duration"""
+        self.state = InterviewState.COMPLETE
+        self.ended_at = datetime.now(timezone.utc)
+        if self._started_monotonic is not None:
+            self.duration_seconds = time.monotonic() - self._started_monotonic
+        elif self.started_at is not None:
+            # Restored in another process: fall back to the wall clock
+            # (sessions saved before timestamps were UTC hold naive local times)
+            started_at = self.started_at if self.started_at.tzinfo else self.started_at.astimezone()
+            self.duration_seconds = (self.ended_at - started_at).total_seconds()
+    
+    async def _complete_interview(self) -> dict:
+        """Mark the interview as ended and build the completion result"""
+        self._end()
+        report = await self._generate_final_report()
+        return {
+            "status": "completed",
+            "report": report
+        }
+    
+    async def _complete_interview_stream(self) -> AsyncIterator[dict]:
+        """Mark the interview as ended and stream the final report frames"""
+        self._end()
+        async for frame in self._generate_final_report_stream():
+            yield frame
+    
+    def _next_question_request(self) -> dict:
+        """Build the LLM request for the next question (state advances in _continue_result)"""
+        return dict(
+            job_description=self.job_description,
+            candidate_profile=self.candidate_profile,
+            previous_questions=self.questions_asked,
+            previous_answers=self.answers_given,
+            question_number=self.current_question_number + 1,
+            total_questions=self.total_questions,
+            cached_content=self.cached_content
+        )
+    
+    def _continue_result(self, next_question: str, evaluation: Optional[Dict]) -> dict:
+        """Advance to the next question and build the continuation result"""
+        # Only advance once the question exists, so a failed generation leaves
+        # the interview on the current question
+        self.questions_asked.append(next_question)
+        self.current_question_number += 1
+        self.state = InterviewState.AWAITING_ANSWER
+        
+        return {
+            "status": "continue",
+            "question": next_question,
+            "question_number": self.current_question_number,
+            "total_questions": self.total_questions,
+            # None while the answer is still being scored in the background
+            "previous_score": evaluation.get("score", 0) if evaluation is not None else None
+        }
+    
     async def process_answer(self, answer: str) -> dict:
         """
         Process candidate's answer and return next question or final report
@@ -112,117 +411,169 @@ class InterviewManager:
                 - final report (if interview complete)
         """
         try:
-            if not self.interview_started:
-                raise ValueError("Interview not started")
+            # Earlier answers are scored first so evaluations stay aligned with answers
+            await self._evaluate_pending_answers(upto=len(self.questions_asked) - 1)
+            question_number = self.current_question_number
+            current_question = self._accept_answer(answer)
             
-            if self.interview_ended:
-                raise ValueError("Interview already ended")
-            
-            # Store the answer
-            self.answers_given.append(answer)
+            # Check if interview is complete
+            if question_number >= self.total_questions:
+                await self._evaluate_answer(question_number, current_question, answer)
+                return await self._complete_interview()
             
-            current_question = self.questions_asked[self.current_question_number - 1]
+            if len(self.evaluations) >= question_number:
+                # Resumed turn whose evaluation already finished: only the question is missing
+                evaluation = self.evaluations[question_number - 1]
+                next_question = await _limited(
+                    self.llm_engine.generate_question(**self._next_question_request())
+                )
+                return self._continue_result(next_question, evaluation)
             
-            # Evaluate the answer using LLM
-            evaluation = await self.llm_engine.evaluate_answer(
+            # Evaluate the answer and generate the next question in one LLM round-trip
+            answered_at = datetime.now(timezone.utc).isoformat()
+            evaluation, next_question = await _limited(self.llm_engine.evaluate_and_next(
                 question=current_question,
                 answer=answer,
-                job_description=self.job_description,
-                candidate_profile={
-                    "name": self.candidate_name,
-                    "experience_years": self.experience_years
-                }
-            )
+                **self._next_question_request()
+            ))
+            self._record_evaluation(question_number, current_question, answer, evaluation, answered_at)
             
-            # Store evaluation and score
-            self.scores.append(evaluation.get("score", 0))
-            self.evaluations.append(evaluation)
+            return self._continue_result(next_question, evaluation)
             
-            # Save answer to storage
-            if self.data_storage:
-                try:
-                    self.data_storage.save_answer(
-                        session_id=self.session_id,
-                        question=current_question,
-                        answer=answer,
-                        score=evaluation.get("score", 0)
-                    )
-                except Exception as e:
-                    logger.error(f"Error saving answer: {e}")
+        except Exception as e:
+            logger.error("Error processing answer: %s", e)
+            raise
+    
+    async def process_answer_stream(self, answer: str) -> AsyncIterator[dict]:
+        """
+        Process candidate's answer, streaming the next question as it is generated
+        
+        Args:
+            answer: The candidate's answer text
             
-            logger.info(
-                f"Answer {self.current_question_number}/{self.total_questions} "
-                f"scored {evaluation.get('score', 0):.1f}/10"
-            )
+        Yields:
+            {"type": "token", "text": ...} frames for the next question (or the
+            final report frames on the last answer), then a
+            {"type": "done", "result": ...} frame with the same result as process_answer;
+            its previous_score is None if the answer is still being scored
+        """
+        try:
+            # Earlier answers are scored first so evaluations stay aligned with answers
+            await self._evaluate_pending_answers(upto=len(self.questions_asked) - 1)
+            question_number = self.current_question_number
+            current_question = self._accept_answer(answer)
             
             # Check if interview is complete
-            if self.current_question_number >= self.total_questions:
-                self.interview_ended = True
-                self.ended_at = datetime.now()
-                report = await self._generate_final_report()
-                return {
-                    "status": "completed",
-                    "report": report
-                }
+            if question_number >= self.total_questions:
+                await self._evaluate_answer(question_number, current_question, answer)
+                async for frame in self._complete_interview_stream():
+                    yield frame
+                return
             
-            # Generate next question
-            self.current_question_number += 1
-            next_question = await self.llm_engine.generate_question(
-                job_description=self.job_description,
-                candidate_profile={
-                    "name": self.candidate_name,
-                    "experience_years": self.experience_years,
-                    "difficulty": self.difficulty
-                },
-                previous_questions=self.questions_asked,
-                previous_answers=self.answers_given,
-                question_number=self.current_question_number,
-                total_questions=self.total_questions
-            )
+            # Score the answer off the critical path: the next question is sent as soon
+            # as it is generated, and the next turn or the report waits for the score.
+            # If the question fails, the evaluation still lands for a resumed turn
+            evaluation_task = None
+            if len(self.evaluations) < question_number:
+                evaluation_task = asyncio.create_task(
+                    self._evaluate_in_background(question_number, current_question, answer)
+                )
+                self._evaluation_task = evaluation_task
+                for tasks in (_background_tasks, self._pending):
+                    tasks.add(evaluation_task)
+                    evaluation_task.add_done_callback(tasks.discard)
             
-            self.questions_asked.append(next_question)
+            chunks = []
+            # The slot is held for the whole stream, which is one Gemini call
+            async with _llm_slot():
+                async for chunk in self.llm_engine.generate_question_stream(
+                    **self._next_question_request()
+                ):
+                    chunks.append(chunk)
+                    yield {"type": "token", "text": chunk}
             
-            return {
-                "status": "continue",
-                "question": next_question,
-                "question_number": self.current_question_number,
-                "total_questions": self.total_questions,
-                "previous_score": evaluation.get("score", 0)
-            }
+            if evaluation_task is None:
+                evaluation = self.evaluations[question_number - 1]
+            elif evaluation_task.done():
+                evaluation = evaluation_task.result()
+            else:
+                evaluation = None
+            next_question = "".join(chunks).strip()
+            yield {"type": "done", "result": self._continue_result(next_question, evaluation)}
             
         except Exception as e:
-            logger.error(f"Error processing answer: {e}")
+            logger.error("Error processing answer: %s", e)
             raise
     
-    async def _generate_final_report(self) -> dict:
-        """Generate comprehensive final interview report"""
+    async def wait_for_evaluation(self):
+        """Wait for the background scoring of the last streamed answer, if it is still running"""
+        if self._evaluation_task is not None:
+            await self._evaluation_task
+            self._evaluation_task = None
+    
+    async def _evaluate_pending_answers(self, upto: Optional[int] = None):
+        """Score any answers (before index upto) that have no evaluation yet, concurrently"""
+        # Let the previous turn's background evaluation land first
+        await self.wait_for_evaluation()
+        
+        pending = range(len(self.evaluations), len(self.answers_given) if upto is None else upto)
+        if not pending:
+            return
+        
+        # One batched Gemini call scores them all (an interview has at most a few)
+        evaluations = await _limited(self.llm_engine.evaluate_answers(
+            [(self.questions_asked[i], self.answers_given[i]) for i in pending],
+            job_description=self.job_description,
+            candidate_profile=self.candidate_profile,
+            cached_content=self.cached_content
+        ))
+        answered_at = datetime.now(timezone.utc).isoformat()
+        for i, evaluation in zip(pending, evaluations):
+            self._record_evaluation(
+                i + 1, self.questions_asked[i], self.answers_given[i], evaluation, answered_at
+            )
+    
+    async def _generate_final_report_stream(self) -> AsyncIterator[dict]:
+        """
+        Generate comprehensive final interview report, streaming the LLM feedback
+        
+        Yields:
+            {"type": "report", "report": ...} with everything known before the LLM runs
+            (except the hire recommendation, which the LLM feedback may revise),
+            {"type": "feedback", "text": ...} frames of the raw feedback as it is generated,
+            then a {"type": "done", "result": {"status": "completed", "report": ...}} frame
+        """
         try:
+            # Score unevaluated answers in parallel before aggregating
+            await self._evaluate_pending_answers()
+            
             # Calculate statistics
-            average_score = sum(self.scores) / len(self.scores) if self.scores else 0
+            average_score = self._average_score()
             
-            # Generate final feedback using LLM
-            final_feedback = await self.llm_engine.generate_final_feedback(
-                job_description=self.job_description,
-                candidate_profile={
-                    "name": self.candidate_name,
-                    "experience_years": self.experience_years
-                },
-                questions_and_answers=list(zip(self.questions_asked, self.answers_given)),
-                scores=self.scores,
-                evaluations=self.evaluations
-            )
+            # One pass over the answered questions builds the report rows and the LLM input
+            questions_and_answers = []
+            qa_pairs = []
+            for number, (question, answer, score, evaluation) in enumerate(zip(
+                self.questions_asked, self.answers_given, self.scores, self.evaluations
+            ), start=1):
+                qa_pairs.append((question, answer))
+                questions_and_answers.append({
+                    "question_number": number,
+                    "question": question,
+                    "answer": answer,
+                    "score": score,
+                    "strengths": evaluation.get("strengths", []),
+                    "weaknesses": evaluation.get("weaknesses", []),
+                    "improvements": evaluation.get("improvements", [])
+                })
             
-            # Determine hire recommendation
-            if average_score >= 7:
-                hire_recommendation = "strong yes"
-            elif average_score >= 6:
-                hire_recommendation = "yes"
-            elif average_score >= 5:
-                hire_recommendation = "maybe"
-            else:
-                hire_recommendation = "no"
+            # Determine hire recommendation (a threshold counts as reached); the
+            # LLM feedback's own recommendation, when it gives one, replaces it
+            hire_recommendation = HIRE_LABELS[bisect.bisect_right(HIRE_THRESHOLDS, average_score)]
             
-            # Build comprehensive report
+            ended_at = self.ended_at.isoformat() if self.ended_at else None
+            
+            # Build comprehensive report; the client gets it before the LLM feedback
             report = {
                 "session_id": self.session_id,
                 "candidate_name": self.candidate_name,
@@ -230,67 +581,90 @@ class InterviewManager:
                 "job_description": self.job_description,
                 "difficulty": self.difficulty,
                 "started_at": self.started_at.isoformat() if self.started_at else None,
-                "ended_at": self.ended_at.isoformat() if self.ended_at else None,
+                "ended_at": ended_at,
+                "duration_seconds": self.duration_seconds,
                 "total_questions": self.total_questions,
                 "average_score": average_score,
                 "individual_scores": self.scores,
                 "hire_recommendation": hire_recommendation,
-                "questions_and_answers": [
-                    {
-                        "question": self.questions_asked[i],
-                        "answer": self.answers_given[i],
-                        "score": self.scores[i],
-                        "strengths": self.evaluations[i].get("strengths", []),
-                        "weaknesses": self.evaluations[i].get("weaknesses", []),
-                        "improvements": self.evaluations[i].get("improvements", [])
-                    }
-                    for i in range(len(self.questions_asked))
-                ],
-                "timestamp": datetime.now().isoformat(),
-                **final_feedback
+                "questions_and_answers": questions_and_answers,
+                "timestamp": ended_at or datetime.now(timezone.utc).isoformat()
+            }
+            yield {
+                "type": "report",
+                "report": {key: value for key, value in report.items() if key != "hire_recommendation"}
             }
             
+            # Stream final feedback from the LLM (one call, so one slot for the whole stream)
+            chunks = []
+            async with _llm_slot():
+                async for chunk in self.llm_engine.stream_final_feedback(
+                    job_description=self.job_description,
+                    candidate_profile={**self.candidate_profile, "answers_summary": qa_pairs},
+                    all_scores=self.scores,
+                    cached_content=self.cached_content
+                ):
+                    chunks.append(chunk)
+                    yield {"type": "feedback", "text": chunk}
+            
+            report.update(self.llm_engine.parse_final_feedback("".join(chunks), average_score))
+            
             logger.info(
-                f"Interview {self.session_id} completed. "
-                f"Final Score: {report['average_score']:.1f}/10, "
-                f"Recommendation: {report.get('hire_recommendation', 'N/A')}"
+                "Interview %s completed. Final Score: %.1f/10, Recommendation: %s",
+                self.session_id, average_score, report["hire_recommendation"]
             )
             
             # Save complete interview session to storage
             if self.data_storage:
-                try:
-                    self.data_storage.save_interview_session(report)
-                except Exception as e:
-                    logger.error(f"Error saving interview session: {e}")
+                self._run_in_background(
+                    "saving interview session",
+                    self.data_storage.save_interview_session,
+                    report
+                )
             
             # Export to Google Sheets if available
             if self.google_sheets and self.google_sheets.is_initialized():
-                try:
-                    self.google_sheets.export_interview(
-                        report,
-                        sheet_name=self.google_sheet_name
-                    )
-                except Exception as e:
-                    logger.error(f"Error exporting to Google Sheets: {e}")
+                self._run_in_background(
+                    "exporting to Google Sheets",
+                    self.google_sheets.export_interview,
+                    report,
+                    sheet_name=self.google_sheet_name
+                )
             
-            return report
+            yield {"type": "done", "result": {"status": "completed", "report": report}}
             
         except Exception as e:
-            logger.error(f"Error generating final report: {e}")
+            logger.error("Error generating final report: %s", e)
             raise
     
+    async def _generate_final_report(self) -> dict:
+        """Generate comprehensive final interview report (the streamed report, collected)"""
+        report = None
+        async for frame in self._generate_final_report_stream():
+            if frame["type"] == "done":
+                report = frame["result"]["report"]
+        return report
+    
     async def generate_final_report(self) -> dict:
         """Public method to generate final report"""
         if not self.interview_ended:
-            self.interview_ended = True
-            self.ended_at = datetime.now()
+            self._end()
         
         return await self._generate_final_report()
     
+    async def generate_final_report_stream(self) -> AsyncIterator[dict]:
+        """Public method to stream the final report (see _generate_final_report_stream)"""
+        if not self.interview_ended:
+            self._end()
+        
+        async for frame in self._generate_final_report_stream():
+            yield frame
+    
     def get_state(self) -> dict:
         """Get current interview state"""
         return {
             "session_id": self.session_id,
+            "state": self.state.name.lower(),
             "interview_started": self.interview_started,
             "interview_ended": self.interview_ended,
             "current_question_number": self.current_question_number,
@@ -298,5 +672,78 @@ class InterviewManager:
             "candidate_name": self.candidate_name,
             "experience_years": self.experience_years,
             "difficulty": self.difficulty,
-            "average_score": sum(self.scores) / len(self.scores) if self.scores else 0
+            "average_score": self._average_score()
         }
+    
+    def to_dict(self) -> dict:
+        """Serialize the full interview state (everything except service handles)"""
+        return {
+            "session_id": self.session_id,
+            "job_description": self.job_description,
+            "candidate_name": self.candidate_name,
+            "experience_years": self.experience_years,
+            "difficulty": self.difficulty,
+            "cached_content": self.cached_content,
+            "current_question_number": self.current_question_number,
+            "total_questions": self.total_questions,
+            "questions_asked": self.questions_asked,
+            "answers_given": self.answers_given,
+            "scores": self.scores,
+            "evaluations": self.evaluations,
+            "state": int(self.state),
+            "interview_started": self.interview_started,
+            "interview_ended": self.interview_ended,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
+            "duration_seconds": self.duration_seconds
+        }
+    
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict,
+        llm_engine,
+        data_storage: Optional[DataStorage] = None,
+        google_sheets: Optional[GoogleSheetsStorage] = None,
+        google_sheet_name: str = "Interview Data"
+    ) -> "InterviewManager":
+        """
+        Rebuild an interview manager from a to_dict() snapshot
+        
+        Args:
+            data: Snapshot produced by to_dict()
+            llm_engine: LLMEngine instance
+            data_storage: DataStorage instance for persisting interview data
+            google_sheets: GoogleSheetsStorage instance for exporting to Google Sheets
+            google_sheet_name: Name of the Google Sheet to export to
+        """
+        manager = cls(
+            llm_engine=llm_engine,
+            job_description=data["job_description"],
+            candidate_name=data["candidate_name"],
+            experience_years=data["experience_years"],
+            difficulty=data["difficulty"],
+            data_storage=data_storage,
+            google_sheets=google_sheets,
+            google_sheet_name=google_sheet_name
+        )
+        manager.session_id = data["session_id"]
+        manager.cached_content = data.get("cached_content")
+        manager.current_question_number = data["current_question_number"]
+        manager.total_questions = data["total_questions"]
+        manager.questions_asked = data["questions_asked"]
+        manager.answers_given = data["answers_given"]
+        manager.scores = data["scores"]
+        manager._score_sum = sum(manager.scores)
+        manager.evaluations = data["evaluations"]
+        if "state" in data:
+            manager.state = InterviewState(data["state"])
+        elif data["interview_ended"]:
+            manager.state = InterviewState.COMPLETE
+        elif data["interview_started"]:
+            # Snapshots from before the state machine are only saved between turns
+            manager.state = InterviewState.AWAITING_ANSWER
+        manager.started_at = datetime.fromisoformat(data["started_at"]) if data["started_at"] else None
+        manager.ended_at = datetime.fromisoformat(data["ended_at"]) if data["ended_at"] else None
+        manager.duration_seconds = data.get("duration_seconds")
+        return manager
@@ -0,0 +1,109 @@
+"""
+LLM Cache - Deterministic response cache for Gemini calls
+Keys responses by a SHA-256 hash of the request payload so identical
+prompts are answered from memory (or Redis) instead of the API
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """In-memory LRU cache of LLM responses with an optional Redis backend"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 86400
+    ):
+        """
+        Initialize LLM cache
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            redis_url: Redis URL for a shared cache (or set LLM_CACHE_REDIS_URL env var)
+            ttl_seconds: Expiry of entries stored in Redis
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._redis = None
+        self.hits = 0
+        self.misses = 0
+
+        redis_url = redis_url or os.getenv("LLM_CACHE_REDIS_URL")
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+
+                self._redis = redis.from_url(redis_url)
+                logger.info("LLM cache using Redis backend")
+            except ImportError:
+                logger.warning("redis not installed. Run: pip install redis")
+
+    @staticmethod
+    def cache_key(model: str, messages, temperature: Optional[float] = None) -> Optional[str]:
+        """
+        Build a deterministic cache key for a request
+
+        Returns None for sampled requests, which must not be cached: temperature > 0,
+        or None (the model's default temperature, which is above 0).
+        """
+        if temperature is None or temperature > 0:
+            return None
+
+        payload = {"model": model, "messages": messages, "temperature": temperature}
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, recording a hit or miss"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        elif self._redis is not None:
+            try:
+                raw = await self._redis.get(f"llm:{key}")
+            except Exception as e:
+                logger.warning(f"LLM cache Redis lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self._remember(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str):
+        """Store a response under the given key"""
+        self._remember(key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"llm:{key}", value, ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"LLM cache Redis write failed: {e}")
+
+    def _remember(self, key: str, value: str):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Get cache hit/miss counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries)
+        }
@@ -4,27 +4,362 @@ Uses Gemini for interview question generation and evaluation
 """
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
 import json
 import logging
 import os
+import orjson
 import asyncio
-from typing import Optional, List, Dict
+import random
+import time
+from datetime import timedelta
+from string import Template
+from typing import AsyncIterator, Optional, List, Dict, Tuple
+
+from llm_cache import LLMCache
+from rate_limiter import TokenBucket
+from semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Retries of a request rejected for quota (429) after client-side throttling
+QUOTA_RETRY_ATTEMPTS = 3
+QUOTA_RETRY_MAX_DELAY = 30.0
+
+# Prompts carry the last MAX_RECENT questions and answers in full and only a
+# short preview of earlier ones, so prompt size stays bounded as interviews grow
+MAX_RECENT = 5
+EARLIER_PREVIEW_CHARS = 120
+
+# Most answers scored by one batched evaluation call
+EVALUATION_BATCH_LIMIT = 20
+
+# System instruction stored with the per-interview cached context
+CONTEXT_SYSTEM_INSTRUCTION = (
+    "You are a professional technical interviewer. The job description and "
+    "difficulty level for this interview are provided as cached context; "
+    "use them for every question, evaluation and summary you produce."
+)
+
+# Static instructions, sent once per model as its system_instruction (see
+# PROMPT_TASKS), so every call carries only the per-call data below
+QUESTION_INSTRUCTION = """You are a professional technical interviewer. Given the job description, difficulty level, candidate profile and the questions asked so far, ask the requested interview question.
+
+INTERVIEW RULES:
+1. Ask ONE clear, specific question
+2. Match the difficulty level
+3. Focus on skills relevant to the job description
+4. If candidate answers were weak, probe deeper
+5. Keep questions professional and conversational
+6. Vary between technical and behavioral questions
+
+Return ONLY the question, nothing else."""
+
+_RUBRIC_INSTRUCTIONS = """1. **Communication** (0-10): Clarity, structure, and articulation
+2. **Technical Accuracy** (0-10): Correctness and depth of technical knowledge
+3. **Completeness** (0-10): How thoroughly the question was addressed"""
+
+EVALUATION_INSTRUCTION = f"""You are a technical interviewer evaluating a candidate's answer, for the job description and difficulty level given.
+
+Evaluate the answer using the following structured rubric:
+
+{_RUBRIC_INSTRUCTIONS}
+
+Provide:
+1. An overall score from 0-10 (average of rubric scores)
+2. Individual rubric scores for communication, technical_accuracy, and completeness
+3. Brief evaluation (2-3 sentences)
+4. 2-3 key strengths
+5. 2-3 areas for improvement
+6. The difficulty level of the question
+
+Return response in JSON format only."""
+
+BATCH_EVALUATION_INSTRUCTION = f"""You are a technical interviewer evaluating a candidate's answers, for the job description and difficulty level given.
+
+Evaluate each item independently using the following structured rubric:
+
+{_RUBRIC_INSTRUCTIONS}
+
+For each item provide an overall score from 0-10 (average of rubric scores), the
+individual rubric scores, a brief evaluation (2-3 sentences), 2-3 key strengths,
+2-3 areas for improvement and the difficulty level of the question.
+
+Return response in JSON format only, with one evaluation per item in item order."""
+
+TURN_INSTRUCTION = f"""You are a professional technical interviewer conducting an interview, for the job description and difficulty level given.
+
+### TASK 1: EVALUATE
+Evaluate the candidate's latest answer using the following structured rubric:
+
+{_RUBRIC_INSTRUCTIONS}
+
+Provide an overall score from 0-10 (average of rubric scores), the individual
+rubric scores, a brief evaluation (2-3 sentences), 2-3 key strengths,
+2-3 areas for improvement and the difficulty level of the question.
+
+### TASK 2: NEXT QUESTION
+Ask the requested next interview question:
+1. Ask ONE clear, specific question
+2. Focus on skills relevant to the job description
+3. If candidate answers were weak, probe deeper
+4. Keep questions professional and conversational
+5. Vary between technical and behavioral questions
+
+Return response in JSON format only."""
+
+FINAL_FEEDBACK_INSTRUCTION = """You are an expert technical interviewer preparing a final evaluation summary.
+
+Given the job description, the candidate profile and the interview scores, generate
+a professional final interview evaluation. hire_recommendation is one of
+"strong yes", "yes", "maybe" or "no".
+
+Return response in JSON format only."""
+
+# Response schemas: Gemini returns JSON that validates against them
+_RUBRIC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "communication": {"type": "number"},
+        "technical_accuracy": {"type": "number"},
+        "completeness": {"type": "number"}
+    },
+    "required": ["communication", "technical_accuracy", "completeness"]
+}
+
+_STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number"},
+        "rubric": _RUBRIC_SCHEMA,
+        "evaluation": {"type": "string"},
+        "strengths": _STRING_LIST_SCHEMA,
+        "improvements": _STRING_LIST_SCHEMA,
+        "question_difficulty": {"type": "string"}
+    },
+    "required": ["score", "rubric", "evaluation", "strengths", "improvements"]
+}
+
+BATCH_EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluations": {"type": "array", "items": EVALUATION_SCHEMA}
+    },
+    "required": ["evaluations"]
+}
+
+TURN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluation": EVALUATION_SCHEMA,
+        "next_question": {"type": "string"}
+    },
+    "required": ["evaluation", "next_question"]
+}
+
+FINAL_FEEDBACK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "number"},
+        "summary": {"type": "string"},
+        "strengths": _STRING_LIST_SCHEMA,
+        "weaknesses": _STRING_LIST_SCHEMA,
+        "recommendations": _STRING_LIST_SCHEMA,
+        "hire_recommendation": {"type": "string"}
+    },
+    "required": [
+        "overall_score", "summary", "strengths", "weaknesses", "recommendations", "hire_recommendation"
+    ]
+}
+
+# Kind of request -> (system instruction, response schema or None for plain text)
+PROMPT_TASKS = {
+    "question": (QUESTION_INSTRUCTION, None),
+    "evaluation": (EVALUATION_INSTRUCTION, EVALUATION_SCHEMA),
+    "batch_evaluation": (BATCH_EVALUATION_INSTRUCTION, BATCH_EVALUATION_SCHEMA),
+    "turn": (TURN_INSTRUCTION, TURN_SCHEMA),
+    "final_feedback": (FINAL_FEEDBACK_INSTRUCTION, FINAL_FEEDBACK_SCHEMA)
+}
+
+# Prompt templates, compiled once at import. They hold only per-call data;
+# the shared job description comes first so Gemini can cache the prefix.
+QUESTION_PROMPT = Template("""${job_section}DIFFICULTY LEVEL: $difficulty
+
+CANDIDATE PROFILE:
+ Name: $name
+ Years of Experience: $experience_years
+ Previous Answers: $answers
+
+$previous_context
+
+Generate interview question $question_number of $total_questions.
+""")
+
+EVALUATION_PROMPT = Template("""${job_section}DIFFICULTY LEVEL: $difficulty
+
+QUESTION ASKED:
+$question
+
+CANDIDATE ANSWER:
+$answer
+""")
+
+# Several answers scored in one call (rescoring for the final report)
+BATCH_EVALUATION_PROMPT = Template("""${job_section}DIFFICULTY LEVEL: $difficulty
+
+Return exactly $count evaluations, in item order.
+
+$items
+""")
+
+# One round-trip per turn: scores the latest answer and asks the next question
+TURN_PROMPT = Template("""${job_section}DIFFICULTY LEVEL: $difficulty
+
+NEXT QUESTION: $question_number of $total_questions
+
+CANDIDATE PROFILE:
+ Name: $name
+ Years of Experience: $experience_years
+
+$previous_context
+
+QUESTION ASKED:
+$question
+
+CANDIDATE ANSWER:
+$answer
+""")
+
+FINAL_FEEDBACK_PROMPT = Template("""${job_section}CANDIDATE PROFILE:
+ Name: $name
+ Experience: $experience_years years
+ Answers Summary: $answers_summary
+
+INTERVIEW SCORES:
+$all_scores
+Average: $average_score/10
+""")
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> Optional[Dict]:
+    """
+    Parse the first complete JSON object in a model response
+
+    Tries each "{" in turn, so prose, markdown fences and stray braces around
+    the object are skipped, and braces inside its strings do not end it early.
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(obj, dict):
+            return obj
+        start = text.find("{", start + 1)
+    return None
+
+
+def _bounded_history(items: List[str]) -> List[str]:
+    """Keep the last MAX_RECENT items whole and shorten earlier ones to a preview"""
+    if len(items) <= MAX_RECENT:
+        return items
+    earlier = [
+        item if len(item) <= EARLIER_PREVIEW_CHARS else item[:EARLIER_PREVIEW_CHARS] + "..."
+        for item in items[:-MAX_RECENT]
+    ]
+    return earlier + items[-MAX_RECENT:]
+
+
+def _previous_context(previous_questions: Optional[List[str]]) -> str:
+    """PREVIOUS QUESTIONS block of a question prompt"""
+    if not previous_questions:
+        return ""
+    return "PREVIOUS QUESTIONS:\n" + "\n".join(_bounded_history(previous_questions))
+
+
+def _prompt_json(obj) -> str:
+    """
+    Compact JSON for embedding in a prompt
+
+    The model reads it as well without indentation, which only costs input
+    tokens; orjson keeps non-ASCII text as-is rather than \\u-escaping it.
+    """
+    return orjson.dumps(obj).decode()
 
 
 class LLMEngine:
-    def __init__(self, model: str = "gemini-1.5-flash", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: str = "gemini-1.5-flash",
+        api_key: Optional[str] = None,
+        temperature: Optional[float] = None,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        context_cache: Optional[bool] = None,
+        context_cache_ttl: int = 300,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
         """
         Initialize LLM Engine
 
         Args:
             model: Model name (gemini-1.5-flash, gemini-1.5-pro, etc.)
             api_key: Google Gemini API key (or set GEMINI_API_KEY env var)
+            temperature: Sampling temperature (or set GEMINI_TEMPERATURE; None uses the
+                model default for questions and 0 for evaluations and feedback)
+            cache: LLMCache for responses (a private in-memory cache by default)
+            semantic_cache: SemanticCache reusing questions for near-duplicate prompts
+                (or set LLM_SEMANTIC_CACHE=1); needs temperature 0
+            context_cache: Cache each interview's static preamble with Gemini's
+                CachedContent API (or set GEMINI_CONTEXT_CACHE=1)
+            context_cache_ttl: Lifetime of cached contexts in seconds
+            requests_per_minute: Client-side request budget, kept just under the Gemini
+                quota (or set GEMINI_RPM; 0 disables)
+            tokens_per_minute: Client-side input token budget, estimated at 4 characters
+                per token (or set GEMINI_TPM; 0 disables)
         """
         self.model = model
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if temperature is None and os.getenv("GEMINI_TEMPERATURE"):
+            temperature = float(os.getenv("GEMINI_TEMPERATURE"))
+        self.temperature = temperature
+        self.cache = cache if cache is not None else LLMCache()
+        if semantic_cache is None and os.getenv("LLM_SEMANTIC_CACHE", "").lower() in {"1", "true", "yes"}:
+            semantic_cache = SemanticCache(
+                index_path=os.getenv("LLM_SEMANTIC_CACHE_PATH"),
+                onnx_model=os.getenv("LLM_SEMANTIC_CACHE_ONNX_MODEL"),
+                tokenizer=os.getenv("LLM_SEMANTIC_CACHE_TOKENIZER")
+            )
+        self.semantic_cache = semantic_cache if semantic_cache and semantic_cache.is_enabled() else None
+        if self.semantic_cache and temperature != 0:
+            # Reusing a question generated for a similar prompt only stands in for
+            # generating it when generation is deterministic
+            logger.warning("Semantic cache disabled: it needs GEMINI_TEMPERATURE=0")
+            self.semantic_cache = None
+        if context_cache is None:
+            context_cache = os.getenv("GEMINI_CONTEXT_CACHE", "").lower() in {"1", "true", "yes"}
+        self.context_cache = context_cache
+        self.context_cache_ttl = context_cache_ttl
+        # cached content name -> [model bound to it, CachedContent, expiry (monotonic)]
+        self._context_models: Dict[str, list] = {}
+        # Cache key -> task of the Gemini call currently answering that request
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._available_models: Optional[List[str]] = None
+        if requests_per_minute is None:
+            requests_per_minute = int(os.getenv("GEMINI_RPM", "1900"))
+        if tokens_per_minute is None:
+            tokens_per_minute = int(os.getenv("GEMINI_TPM", "3800000"))
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
         self._initialized = False
 
         if not self.api_key:
@@ -33,207 +368,678 @@ class LLMEngine:
 
         genai.configure(api_key=self.api_key)
         self.client = genai.GenerativeModel(model)
+        self._generation_config = (
+            genai.GenerationConfig(temperature=temperature) if temperature is not None else None
+        )
+        # One model per kind of request, carrying that request's static instruction.
+        # Models are cheap: they all send through the SDK's one shared async client
+        self._task_models = {
+            task: genai.GenerativeModel(model, system_instruction=instruction)
+            for task, (instruction, _) in PROMPT_TASKS.items()
+        }
+        # Scores and feedback are reproducible, so they can be cached; questions
+        # keep sampling so candidates with the same profile get different ones
+        self._scoring_temperature = temperature if temperature is not None else 0.0
+        self._task_configs = {
+            task: genai.GenerationConfig(
+                temperature=self._scoring_temperature,
+                response_mime_type="application/json",
+                response_schema=schema
+            )
+            for task, (_, schema) in PROMPT_TASKS.items()
+            if schema is not None
+        }
 
     async def initialize(self):
-        """Initialize Gemini API"""
+        """Initialize Gemini API: open the connection and list the available models"""
         try:
-            response = await asyncio.to_thread(self.client.generate_content, "Hello")
+            await asyncio.gather(self.warmup(), self.get_available_models())
             self._initialized = True
             logger.info(f"LLM Engine initialized with model: {self.model}")
-            return response.text
         except Exception as e:
             logger.error(f"Failed to initialize Gemini API: {e}")
             raise
 
+    async def warmup(self):
+        """
+        Open the TCP/TLS/HTTP2 channel to Gemini before the first real interview
+        request, with a countTokens call: it checks the API key and the model
+        name without running (or billing) a generation
+
+        Must run on the serving event loop: the SDK's async gRPC channel, shared
+        by every request in the process, is bound to the loop that opens it.
+        """
+        await self.client.count_tokens_async("ping")
+
+    async def get_available_models(self) -> List[str]:
+        """Names of the Gemini models that support generateContent (listed once, then cached)"""
+        if self._available_models is None:
+            models = await asyncio.to_thread(lambda: list(genai.list_models()))
+            self._available_models = [
+                model.name for model in models
+                if "generateContent" in model.supported_generation_methods
+            ]
+        return self._available_models
+
     def is_initialized(self) -> bool:
         return self._initialized
 
-    async def generate_question(
+    def close(self):
+        """Persist caches on shutdown"""
+        if self.semantic_cache:
+            self.semantic_cache.save()
+
+    async def _send(self, model, prompt: str, task: Optional[str] = None, **kwargs):
+        """
+        Call generate_content_async within the client-side quotas
+
+        Waits for the request and token budgets before each attempt, and retries
+        a 429 with exponential backoff and jitter.
+        """
+        generation_config = self._task_configs.get(task, self._generation_config)
+        # The system instruction is billed as input tokens too
+        characters = len(prompt) + (len(PROMPT_TASKS[task][0]) if task else 0)
+        for attempt in range(QUOTA_RETRY_ATTEMPTS + 1):
+            if self._request_bucket:
+                await self._request_bucket.acquire()
+            if self._token_bucket:
+                await self._token_bucket.acquire(characters // 4 + 1)
+            try:
+                return await model.generate_content_async(
+                    prompt, generation_config=generation_config, **kwargs
+                )
+            except google_exceptions.ResourceExhausted:
+                if attempt == QUOTA_RETRY_ATTEMPTS:
+                    raise
+                delay = min(QUOTA_RETRY_MAX_DELAY, 2 ** attempt) * (0.5 + random.random())
+                logger.warning(f"Gemini quota exceeded, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def create_context_cache(
         self,
         job_description: str,
-        candidate_profile: Dict,
-        previous_questions: List[str] = None,
         difficulty: str = "intermediate"
+    ) -> Optional[str]:
+        """
+        Cache the static interview preamble with Gemini's CachedContent API
+
+        Returns:
+            Cached content name, or None when context caching is disabled or
+            the preamble could not be cached (e.g. below the model's minimum size)
+        """
+        if not self.context_cache:
+            return None
+
+        try:
+            cached = await asyncio.to_thread(
+                caching.CachedContent.create,
+                model=self.model,
+                system_instruction=CONTEXT_SYSTEM_INSTRUCTION,
+                contents=[f"JOB DESCRIPTION:\n{job_description}\n\nDIFFICULTY LEVEL: {difficulty}"],
+                ttl=timedelta(seconds=self.context_cache_ttl)
+            )
+        except Exception as e:
+            logger.warning(f"Context caching unavailable, sending full prompts: {e}")
+            return None
+
+        self._context_models[cached.name] = [
+            genai.GenerativeModel.from_cached_content(cached),
+            cached,
+            time.monotonic() + self.context_cache_ttl
+        ]
+        return cached.name
+
+    async def _context_model(self, cached_content: Optional[str]):
+        """Get the model bound to a cached context, refreshing its TTL on use"""
+        entry = self._context_models.get(cached_content) if cached_content else None
+        if entry is None:
+            return None
+
+        model, cached, expires_at = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            self._context_models.pop(cached_content, None)
+            return None
+        if remaining < self.context_cache_ttl / 2:
+            try:
+                await asyncio.to_thread(cached.update, ttl=timedelta(seconds=self.context_cache_ttl))
+                entry[2] = time.monotonic() + self.context_cache_ttl
+            except Exception as e:
+                logger.warning(f"Failed to refresh cached context {cached_content}: {e}")
+        return model
+
+    @staticmethod
+    def _job_section(job_description: str, context_model) -> str:
+        """Job description block, omitted when it is already in the cached context"""
+        if context_model is not None:
+            return ""
+        return f"JOB DESCRIPTION:\n{job_description}\n\n"
+
+    def _task_temperature(self, task: Optional[str]) -> Optional[float]:
+        """Temperature a task's requests are sampled at (None: the model default)"""
+        if task is not None and PROMPT_TASKS[task][1] is not None:
+            return self._scoring_temperature
+        return self.temperature
+
+    def _resolve(
+        self, prompt: str, cached_content: Optional[str], task: Optional[str] = None
+    ) -> Tuple[object, str, Optional[str], bool]:
+        """
+        Pick the model for a request, the prompt to send it and its response-cache key
+
+        A model bound to a cached context has its own system instruction, so the
+        task's instruction is sent at the top of the prompt instead.
+        """
+        entry = self._context_models.get(cached_content) if cached_content else None
+        if entry:
+            model = entry[0]
+            if task:
+                prompt = f"{PROMPT_TASKS[task][0]}\n\n{prompt}"
+        else:
+            model = self._task_models[task] if task else self.client
+        # The cached context or task instruction is part of the request, so it is part of the key
+        key = self.cache.cache_key(
+            cached_content if entry else f"{self.model}/{task}" if task else self.model,
+            prompt,
+            self._task_temperature(task)
+        )
+        return model, prompt, key, entry is not None
+
+    async def _generate(
+        self,
+        prompt: str,
+        cached_content: Optional[str] = None,
+        task: Optional[str] = None
+    ) -> str:
+        """
+        Run a prompt through Gemini, short-circuiting on cached responses
+
+        Args:
+            prompt: Full prompt text
+            cached_content: Name of a Gemini cached context to run the prompt against
+            task: PROMPT_TASKS entry whose instruction and response schema apply
+        """
+        model, prompt, key, uses_context = self._resolve(prompt, cached_content, task)
+        if key is None:
+            return await self._generate_uncached(prompt, model, key, uses_context, task)
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Single flight: concurrent identical requests share one Gemini call. The call
+        # runs as its own task, so a caller that is cancelled does not cancel the others
+        call = self._inflight.get(key)
+        if call is None:
+            call = asyncio.create_task(
+                self._generate_uncached(prompt, model, key, uses_context, task)
+            )
+            self._inflight[key] = call
+            call.add_done_callback(lambda done: self._inflight_done(key, done))
+        return await asyncio.shield(call)
+
+    def _inflight_done(self, key: str, task: asyncio.Task):
+        """Forget a finished single-flight call"""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved, in case every caller was cancelled
+            task.exception()
+
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        model,
+        key: Optional[str],
+        uses_context: bool,
+        task: Optional[str] = None
     ) -> str:
-        """Generate interview question"""
+        """Answer a prompt missing from the exact cache (semantic cache, then Gemini)"""
+        # Only questions go through the semantic tier: scores and feedback must come
+        # from this exact answer, never a similar one. Prompts relying on a cached
+        # context omit the job description, so they cannot be compared across interviews
+        semantic = self.semantic_cache if task == "question" and not uses_context else None
+        vector = None
+        if semantic:
+            try:
+                cached, vector = await semantic.lookup(prompt)
+            except Exception as e:
+                logger.warning(f"Semantic cache lookup failed: {e}")
+                semantic = None
+            else:
+                if cached is not None:
+                    if key is not None:
+                        await self.cache.set(key, cached)
+                    return cached
 
-        previous_context = ""
-        if previous_questions:
-            previous_context = "PREVIOUS QUESTIONS:\n" + "\n".join(previous_questions)
+        # Native async call on the SDK's shared channel: no worker thread per request
+        response = await self._send(model, prompt, task)
+        response_text = response.text.strip()
 
-        prompt = f"""You are a professional technical interviewer conducting an interview for the following position:
+        if key is not None:
+            await self.cache.set(key, response_text)
+        if semantic:
+            semantic.add(vector, response_text)
+        return response_text
 
-JOB DESCRIPTION:
-{job_description}
+    async def generate_stream(
+        self,
+        prompt: str,
+        cached_content: Optional[str] = None,
+        task: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a Gemini response chunk by chunk
 
-CANDIDATE PROFILE:
- Name: {candidate_profile.get('name', 'Candidate')}
- Years of Experience: {candidate_profile.get('experience_years', 0)}
- Previous Answers: {json.dumps(candidate_profile.get('answers', []), indent=2)}
+        A cached response is yielded as a single chunk. The semantic cache is
+        skipped, since its embedding round-trip would delay the first token.
+        """
+        model, prompt, key, _ = self._resolve(prompt, cached_content, task)
+        if key is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
 
-{previous_context}
+        response = await self._send(model, prompt, task, stream=True)
+        chunks = []
+        async for chunk in response:
+            text = chunk.text
+            if text:
+                chunks.append(text)
+                yield text
 
-INTERVIEW RULES:
-1. Ask ONE clear, specific question
-2. Difficulty level: {difficulty}
-3. Focus on skills relevant to the job description
-4. If candidate answers were weak, probe deeper
-5. Keep questions professional and conversational
-6. Vary between technical and behavioral questions
+        if key is not None:
+            await self.cache.set(key, "".join(chunks).strip())
 
-Generate the next interview question. Return ONLY the question, nothing else.
-"""
+    async def _question_prompt(
+        self,
+        job_description: str,
+        candidate_profile: Dict,
+        previous_questions: Optional[List[str]] = None,
+        previous_answers: Optional[List[str]] = None,
+        question_number: int = 1,
+        total_questions: int = 5,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Build the question prompt and the cached context it relies on"""
+        if difficulty is None:
+            difficulty = candidate_profile.get('difficulty', 'intermediate')
+        if previous_answers is None:
+            previous_answers = candidate_profile.get('answers', [])
+
+        context_model = await self._context_model(cached_content)
+
+        prompt = QUESTION_PROMPT.substitute(
+            job_section=self._job_section(job_description, context_model),
+            difficulty=difficulty,
+            name=candidate_profile.get('name', 'Candidate'),
+            experience_years=candidate_profile.get('experience_years', 0),
+            answers=_prompt_json(_bounded_history(previous_answers)),
+            previous_context=_previous_context(previous_questions),
+            question_number=question_number,
+            total_questions=total_questions
+        )
+        return prompt, cached_content if context_model else None
+
+    async def generate_question(
+        self,
+        job_description: str,
+        candidate_profile: Dict,
+        previous_questions: List[str] = None,
+        previous_answers: Optional[List[str]] = None,
+        question_number: int = 1,
+        total_questions: int = 5,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None
+    ) -> str:
+        """
+        Generate interview question
+
+        difficulty and previous_answers default to the candidate profile's
+        "difficulty" and "answers" entries.
+        """
+        prompt, cached_content = await self._question_prompt(
+            job_description, candidate_profile, previous_questions, previous_answers,
+            question_number, total_questions, difficulty, cached_content
+        )
 
         try:
-            response = await asyncio.to_thread(self.client.generate_content, prompt)
-            return response.text.strip()
+            return await self._generate(prompt, cached_content, task="question")
         except Exception as e:
             logger.error(f"Error generating question: {e}")
             raise
 
+    async def generate_question_stream(
+        self,
+        job_description: str,
+        candidate_profile: Dict,
+        previous_questions: List[str] = None,
+        previous_answers: Optional[List[str]] = None,
+        question_number: int = 1,
+        total_questions: int = 5,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate interview question, yielding text chunks as they arrive
+
+        difficulty and previous_answers default to the candidate profile's
+        "difficulty" and "answers" entries.
+        """
+        prompt, cached_content = await self._question_prompt(
+            job_description, candidate_profile, previous_questions, previous_answers,
+            question_number, total_questions, difficulty, cached_content
+        )
+
+        try:
+            async for chunk in self.generate_stream(prompt, cached_content, task="question"):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming question: {e}")
+            raise
+
+    @staticmethod
+    def _complete_evaluation(result: Dict, difficulty: str) -> Dict:
+        """Fill in fields the model left out of an evaluation"""
+        # Ensure question_difficulty is present
+        if "question_difficulty" not in result:
+            result["question_difficulty"] = difficulty
+        # Ensure rubric is present
+        if "rubric" not in result:
+            score = result.get("score", 6)
+            # Distribute score with slight variation
+            result["rubric"] = {
+                "communication": max(0, min(10, score - 0.5)),
+                "technical_accuracy": score,
+                "completeness": max(0, min(10, score + 0.5))
+            }
+        return result
+
+    @staticmethod
+    def _fallback_evaluation(response_text: str, difficulty: str) -> Dict:
+        """Neutral evaluation for a response that is not JSON"""
+        return {
+            "score": 6,
+            "rubric": {
+                "communication": 6,
+                "technical_accuracy": 6,
+                "completeness": 6
+            },
+            "evaluation": response_text,
+            "strengths": ["Attempted answer"],
+            "improvements": ["Needs more clarity"],
+            "question_difficulty": difficulty
+        }
+
+    def _parse_evaluation(self, response_text: str, difficulty: str) -> Dict:
+        """Extract the evaluation JSON from an evaluation response"""
+        result = _extract_json(response_text)
+        if result is not None:
+            return self._complete_evaluation(result, difficulty)
+        else:
+            return self._fallback_evaluation(response_text, difficulty)
+
     async def evaluate_answer(
         self,
         question: str,
         answer: str,
         job_description: str,
-        difficulty: str = "intermediate"
+        candidate_profile: Optional[Dict] = None,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None
     ) -> Dict:
-        """Evaluate candidate's answer"""
+        """Evaluate candidate's answer (difficulty defaults to the profile's, then intermediate)"""
 
-        prompt = f"""You are a technical interviewer evaluating a candidate's answer.
+        if difficulty is None:
+            difficulty = (candidate_profile or {}).get('difficulty', 'intermediate')
 
-JOB DESCRIPTION:
-{job_description}
+        context_model = await self._context_model(cached_content)
 
-QUESTION ASKED:
-{question}
+        prompt = EVALUATION_PROMPT.substitute(
+            job_section=self._job_section(job_description, context_model),
+            difficulty=difficulty,
+            question=question,
+            answer=answer
+        )
 
-CANDIDATE ANSWER:
-{answer}
+        try:
+            response_text = await self._generate(
+                prompt, cached_content if context_model else None, task="evaluation"
+            )
+            return self._parse_evaluation(response_text, difficulty)
 
-DIFFICULTY LEVEL: {difficulty}
+        except Exception as e:
+            logger.error(f"Error evaluating answer: {e}")
+            raise
 
-Evaluate this answer using the following structured rubric:
+    async def evaluate_answers(
+        self,
+        questions_and_answers: List[Tuple[str, str]],
+        job_description: str,
+        candidate_profile: Optional[Dict] = None,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        batch_size: int = 10
+    ) -> List[Dict]:
+        """
+        Evaluate several answers, batch_size (at most EVALUATION_BATCH_LIMIT) per Gemini call
 
-1. **Communication** (0-10): Clarity, structure, and articulation
-2. **Technical Accuracy** (0-10): Correctness and depth of technical knowledge
-3. **Completeness** (0-10): How thoroughly the question was addressed
+        Batches run concurrently. A batch whose response does not hold one evaluation
+        per answer is re-scored answer by answer with evaluate_answer.
 
-Provide:
-1. An overall score from 0-10 (average of rubric scores)
-2. Individual rubric scores for communication, technical_accuracy, and completeness
-3. Brief evaluation (2-3 sentences)
-4. 2-3 key strengths
-5. 2-3 areas for improvement
-6. The difficulty level of the question
+        Returns:
+            Evaluations in the order of questions_and_answers
+        """
+        if difficulty is None:
+            difficulty = (candidate_profile or {}).get('difficulty', 'intermediate')
+        batch_size = max(1, min(batch_size, EVALUATION_BATCH_LIMIT))
 
-Return response in JSON format only:
-{{
-  "score": 0,
-  "rubric": {{
-    "communication": 0,
-    "technical_accuracy": 0,
-    "completeness": 0
-  }},
-  "evaluation": "",
-  "strengths": [],
-  "improvements": [],
-  "question_difficulty": "{difficulty}"
-}}
-"""
+        context_model = await self._context_model(cached_content)
+        job_section = self._job_section(job_description, context_model)
+        cached_content = cached_content if context_model else None
+
+        async def evaluate_batch(batch: List[Tuple[str, str]]) -> List[Dict]:
+            items = "\n".join(
+                f"### ITEM {number}\nQUESTION ASKED:\n{question}\n\nCANDIDATE ANSWER:\n{answer}\n"
+                for number, (question, answer) in enumerate(batch, start=1)
+            )
+            prompt = BATCH_EVALUATION_PROMPT.substitute(
+                job_section=job_section,
+                difficulty=difficulty,
+                count=len(batch),
+                items=items
+            )
+            response_text = await self._generate(prompt, cached_content, task="batch_evaluation")
+
+            result = _extract_json(response_text)
+            evaluations = result.get("evaluations") if result is not None else None
+            if (
+                isinstance(evaluations, list)
+                and len(evaluations) == len(batch)
+                and all(isinstance(evaluation, dict) for evaluation in evaluations)
+            ):
+                return [self._complete_evaluation(evaluation, difficulty) for evaluation in evaluations]
+
+            logger.warning(f"Batched evaluation returned a malformed response, scoring {len(batch)} answers one by one")
+            return await asyncio.gather(*(
+                self.evaluate_answer(
+                    question=question,
+                    answer=answer,
+                    job_description=job_description,
+                    difficulty=difficulty,
+                    cached_content=cached_content
+                )
+                for question, answer in batch
+            ))
 
         try:
-            response = await asyncio.to_thread(self.client.generate_content, prompt)
-            response_text = response.text.strip()
-
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                result = json.loads(response_text[start:end])
-                # Ensure question_difficulty is present
-                if "question_difficulty" not in result:
-                    result["question_difficulty"] = difficulty
-                # Ensure rubric is present
-                if "rubric" not in result:
-                    score = result.get("score", 6)
-                    # Distribute score with slight variation
-                    result["rubric"] = {
-                        "communication": max(0, min(10, score - 0.5)),
-                        "technical_accuracy": score,
-                        "completeness": max(0, min(10, score + 0.5))
-                    }
-                return result
-            else:
-                return {
-                    "score": 6,
-                    "rubric": {
-                        "communication": 6,
-                        "technical_accuracy": 6,
-                        "completeness": 6
-                    },
-                    "evaluation": response_text,
-                    "strengths": ["Attempted answer"],
-                    "improvements": ["Needs more clarity"],
-                    "question_difficulty": difficulty
-                }
+            batches = await asyncio.gather(*(
+                evaluate_batch(questions_and_answers[i:i + batch_size])
+                for i in range(0, len(questions_and_answers), batch_size)
+            ))
+        except Exception as e:
+            logger.error(f"Error evaluating answers: {e}")
+            raise
+        return [evaluation for batch in batches for evaluation in batch]
+
+    async def evaluate_and_next(
+        self,
+        question: str,
+        answer: str,
+        job_description: str,
+        candidate_profile: Dict,
+        previous_questions: List[str] = None,
+        previous_answers: Optional[List[str]] = None,
+        question_number: int = 2,
+        total_questions: int = 5,
+        difficulty: Optional[str] = None,
+        cached_content: Optional[str] = None
+    ) -> Tuple[Dict, str]:
+        """
+        Evaluate the latest answer and generate the next question in one Gemini call
+
+        Takes the evaluate_answer arguments plus the generate_question ones for the
+        next question. If the model leaves out the next question, it is generated
+        with a separate call.
+
+        Returns:
+            (evaluation, next question)
+        """
+        if difficulty is None:
+            difficulty = candidate_profile.get('difficulty', 'intermediate')
+
+        context_model = await self._context_model(cached_content)
+
+        prompt = TURN_PROMPT.substitute(
+            job_section=self._job_section(job_description, context_model),
+            difficulty=difficulty,
+            question_number=question_number,
+            total_questions=total_questions,
+            name=candidate_profile.get('name', 'Candidate'),
+            experience_years=candidate_profile.get('experience_years', 0),
+            previous_context=_previous_context(previous_questions),
+            question=question,
+            answer=answer
+        )
+
+        try:
+            response_text = await self._generate(
+                prompt, cached_content if context_model else None, task="turn"
+            )
 
+            result = _extract_json(response_text)
+            if result is not None:
+                evaluation = result.get("evaluation")
+                evaluation = (
+                    self._complete_evaluation(evaluation, difficulty)
+                    if isinstance(evaluation, dict)
+                    else self._fallback_evaluation(response_text, difficulty)
+                )
+                next_question = str(result.get("next_question") or "").strip()
+            else:
+                evaluation = self._fallback_evaluation(response_text, difficulty)
+                next_question = ""
         except Exception as e:
-            logger.error(f"Error evaluating answer: {e}")
+            logger.error(f"Error evaluating answer and generating next question: {e}")
             raise
 
-    async def final_feedback(
+        if not next_question:
+            next_question = await self.generate_question(
+                job_description=job_description,
+                candidate_profile=candidate_profile,
+                previous_questions=previous_questions,
+                previous_answers=previous_answers,
+                question_number=question_number,
+                total_questions=total_questions,
+                difficulty=difficulty,
+                cached_content=cached_content
+            )
+        return evaluation, next_question
+
+    async def _final_feedback_prompt(
         self,
         job_description: str,
         candidate_profile: Dict,
-        all_scores: List[int]
-    ) -> Dict:
-        """Generate final interview feedback"""
+        all_scores: List[int],
+        cached_content: Optional[str]
+    ) -> Tuple[str, Optional[str], float]:
+        """Build the final feedback prompt; returns (prompt, usable cached_content, average)"""
 
         average_score = sum(all_scores) / max(len(all_scores), 1)
 
-        prompt = f"""You are an expert technical interviewer preparing a final evaluation summary.
+        context_model = await self._context_model(cached_content)
 
-JOB DESCRIPTION:
-{job_description}
+        prompt = FINAL_FEEDBACK_PROMPT.substitute(
+            job_section=self._job_section(job_description, context_model),
+            name=candidate_profile.get('name'),
+            experience_years=candidate_profile.get('experience_years'),
+            answers_summary=_prompt_json(candidate_profile.get('answers_summary', [])),
+            all_scores=all_scores,
+            average_score=f"{average_score:.1f}"
+        )
+        return prompt, cached_content if context_model else None, average_score
 
-CANDIDATE PROFILE:
- Name: {candidate_profile.get('name')}
- Experience: {candidate_profile.get('experience_years')} years
- Answers Summary: {json.dumps(candidate_profile.get('answers_summary', []), indent=2)}
+    @staticmethod
+    def parse_final_feedback(response_text: str, average_score: float) -> Dict:
+        """Extract the feedback JSON from a final feedback response"""
+        result = _extract_json(response_text)
+        if result is not None:
+            return result
+        else:
+            return {
+                "overall_score": round(average_score),
+                "summary": response_text,
+                "strengths": [],
+                "weaknesses": [],
+                "recommendations": [],
+                "hire_recommendation": "maybe"
+            }
 
-INTERVIEW SCORES:
-{all_scores}
-Average: {average_score:.1f}/10
-
-Generate a professional final interview evaluation in JSON format:
-{{
-  "overall_score": 0,
-  "summary": "",
-  "strengths": [],
-  "weaknesses": [],
-  "recommendations": [],
-  "hire_recommendation": "strong yes|yes|maybe|no"
-}}
-"""
+    async def final_feedback(
+        self,
+        job_description: str,
+        candidate_profile: Dict,
+        all_scores: List[int],
+        cached_content: Optional[str] = None
+    ) -> Dict:
+        """Generate final interview feedback"""
 
-        try:
-            response = await asyncio.to_thread(self.client.generate_content, prompt)
-            response_text = response.text.strip()
+        prompt, cached_content, average_score = await self._final_feedback_prompt(
+            job_description, candidate_profile, all_scores, cached_content
+        )
 
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                return json.loads(response_text[start:end])
-            else:
-                return {
-                    "overall_score": round(average_score),
-                    "summary": response_text,
-                    "strengths": [],
-                    "weaknesses": [],
-                    "recommendations": [],
-                    "hire_recommendation": "maybe"
-                }
+        try:
+            response_text = await self._generate(prompt, cached_content, task="final_feedback")
+            return self.parse_final_feedback(response_text, average_score)
 
         except Exception as e:
             logger.error(f"Error generating final feedback: {e}")
             raise
+
+    # Previous name of final_feedback, kept for existing callers
+    generate_final_feedback = final_feedback
+
+    async def stream_final_feedback(
+        self,
+        job_description: str,
+        candidate_profile: Dict,
+        all_scores: List[int],
+        cached_content: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw final feedback response chunk by chunk
+
+        Join the chunks and pass them to parse_final_feedback for the same
+        result as final_feedback.
+        """
+        prompt, cached_content, _ = await self._final_feedback_prompt(
+            job_description, candidate_profile, all_scores, cached_content
+        )
+
+        try:
+            async for chunk in self.generate_stream(prompt, cached_content, task="final_feedback"):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming final feedback: {e}")
+            raise
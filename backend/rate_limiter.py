@@ -0,0 +1,47 @@
+"""
+Rate Limiter - Client-side token buckets for Gemini quotas
+Makes bursts wait briefly in-process instead of failing with 429 and retrying
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Continuously refilling budget of `rate` units per `period` seconds"""
+
+    def __init__(self, rate: float, period: float = 60.0):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Units available per period (also the burst capacity)
+            period: Refill period in seconds
+        """
+        self.capacity = rate
+        self._per_second = rate / period
+        self._tokens = rate
+        self._updated = time.monotonic()
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` units are available and take them"""
+        # A request larger than the whole bucket still goes through once it is full
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self._per_second)
+                self._refill()
+            self._tokens -= amount
+
+    def available(self) -> float:
+        """Units that could be taken right now"""
+        self._refill()
+        return self._tokens
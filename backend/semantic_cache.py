@@ -0,0 +1,227 @@
+"""
+Semantic Cache - Reuses LLM responses for near-duplicate prompts
+Embeds prompts with Gemini (or a local ONNX sentence model) and matches them by
+cosine similarity against an LRU-bounded NumPy matrix of previous prompt embeddings
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import google.generativeai as genai
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError:
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Embedding-based response cache; a brute-force dot product over at most max_entries rows"""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        embedding_model: str = "models/text-embedding-004",
+        index_path: Optional[str] = None,
+        max_entries: int = 1024,
+        onnx_model: Optional[str] = None,
+        tokenizer: Optional[str] = None
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached response to be reused
+            embedding_model: Gemini embedding model used for prompts
+            index_path: File the embeddings are persisted to on shutdown (loaded if present)
+            max_entries: Maximum number of responses kept; the least recently used is evicted
+            onnx_model: Path to an ONNX sentence embedding model (e.g. all-MiniLM-L6-v2)
+                run in-process instead of calling the Gemini embedding API
+            tokenizer: tokenizer.json path or Hugging Face model id for onnx_model
+                (default: sentence-transformers/all-MiniLM-L6-v2)
+        """
+        self.threshold = threshold
+        self.embedding_model = embedding_model
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self.onnx_model = onnx_model
+        self.tokenizer = tokenizer or "sentence-transformers/all-MiniLM-L6-v2"
+        # Loaded on first use, by whichever worker thread gets there first
+        self._session = None
+        self._tokenizer = None
+        self._onnx_lock = threading.Lock()
+        # Unit-length embeddings, one row per response (rows past _size are unused)
+        self._vectors = None
+        # Logical clock of each row's last hit or insert, for LRU eviction
+        self._last_used = None
+        self._clock = 0
+        self._size = 0
+        self._responses: List[str] = []
+        self.hits = 0
+        self.misses = 0
+
+        if np is None:
+            logger.warning("numpy not installed. Run: pip install numpy")
+            return
+
+        if onnx_model and ort is None:
+            logger.warning("onnxruntime not installed, embedding with Gemini. Run: pip install onnxruntime tokenizers")
+            self.onnx_model = None
+
+        if index_path and os.path.exists(index_path):
+            self._load()
+
+    def is_enabled(self) -> bool:
+        """Check if the NumPy backend is available"""
+        return np is not None
+
+    async def embed(self, text: str):
+        """Embed text as a unit-length float32 vector"""
+        if self.onnx_model:
+            # ONNX Runtime releases the GIL, so inference in a worker thread keeps the loop free
+            vector = await asyncio.to_thread(self._embed_local, text)
+        else:
+            result = await genai.embed_content_async(model=self.embedding_model, content=text)
+            vector = np.asarray(result["embedding"], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def _load_onnx(self):
+        """Create the ONNX Runtime session and tokenizer"""
+        with self._onnx_lock:
+            if self._session is not None:
+                return
+            if os.path.exists(self.tokenizer):
+                tokenizer = Tokenizer.from_file(self.tokenizer)
+            else:
+                tokenizer = Tokenizer.from_pretrained(self.tokenizer)
+            # Long prompts are split into windows the model can take (see _embed_local)
+            tokenizer.no_padding()
+            tokenizer.enable_truncation(max_length=256)
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = 2
+            session = ort.InferenceSession(
+                self.onnx_model, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            self._input_names = {node.name for node in session.get_inputs()}
+            self._tokenizer = tokenizer
+            self._session = session
+
+    def _embed_local(self, text: str):
+        """Mean-pool the local model's token embeddings over every window of the text"""
+        if self._session is None:
+            self._load_onnx()
+
+        encoding = self._tokenizer.encode(text)
+        total = None
+        count = 0
+        # Prompts differing only past the first window must not look identical,
+        # so every overflowing window contributes to the mean
+        for window in [encoding] + encoding.overflowing:
+            inputs = {
+                "input_ids": np.asarray([window.ids], dtype=np.int64),
+                "attention_mask": np.asarray([window.attention_mask], dtype=np.int64),
+                "token_type_ids": np.asarray([window.type_ids], dtype=np.int64)
+            }
+            hidden = self._session.run(
+                None, {name: value for name, value in inputs.items() if name in self._input_names}
+            )[0][0]
+            summed = hidden.sum(axis=0)
+            total = summed if total is None else total + summed
+            count += len(window.ids)
+        return (total / count).astype(np.float32)
+
+    def _touch(self, row: int):
+        """Mark a row as most recently used"""
+        self._clock += 1
+        self._last_used[row] = self._clock
+
+    async def lookup(self, prompt: str) -> Tuple[Optional[str], object]:
+        """
+        Find a cached response for a semantically similar prompt
+
+        Returns:
+            (response or None, prompt embedding to pass to add() on a miss)
+        """
+        vector = await self.embed(prompt)
+
+        if self._size:
+            similarities = self._vectors[:self._size] @ vector
+            best = int(similarities.argmax())
+            if similarities[best] >= self.threshold:
+                self._touch(best)
+                self.hits += 1
+                return self._responses[best], vector
+
+        self.misses += 1
+        return None, vector
+
+    def add(self, vector, response: str):
+        """Store a response under a prompt embedding, evicting the LRU entry when full"""
+        if self._vectors is None:
+            self._vectors = np.empty((self.max_entries, vector.shape[0]), dtype=np.float32)
+            self._last_used = np.zeros(self.max_entries, dtype=np.int64)
+
+        if self._size < self.max_entries:
+            row = self._size
+            self._size += 1
+            self._responses.append(response)
+        else:
+            row = int(self._last_used.argmin())
+            self._responses[row] = response
+        self._vectors[row] = vector
+        self._touch(row)
+
+    def save(self):
+        """Persist the embeddings and their responses to index_path"""
+        if not self.index_path or not self._size:
+            return
+
+        try:
+            # Write to temp files and swap them in so a crash never leaves a torn index
+            with open(self.index_path + ".tmp", 'wb') as f:
+                np.save(f, self._vectors[:self._size])
+            with open(self.index_path + ".json.tmp", 'w', encoding='utf-8') as f:
+                json.dump(self._responses, f, ensure_ascii=False)
+            os.replace(self.index_path + ".tmp", self.index_path)
+            os.replace(self.index_path + ".json.tmp", self.index_path + ".json")
+            logger.info(f"Saved {self._size} semantic cache entries to {self.index_path}")
+        except Exception as e:
+            logger.error(f"Error saving semantic cache: {e}")
+
+    def _load(self):
+        """Load previously persisted embeddings (at most max_entries of them)"""
+        try:
+            vectors = np.load(self.index_path)
+            with open(self.index_path + ".json", 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+            if len(vectors) != len(responses):
+                raise ValueError("embeddings and responses are out of sync")
+            vectors = vectors[-self.max_entries:]
+            responses = responses[-self.max_entries:]
+            if not responses:
+                return
+            for vector, response in zip(vectors, responses):
+                self.add(vector, response)
+            logger.info(f"Loaded {self._size} semantic cache entries from {self.index_path}")
+        except Exception as e:
+            logger.error(f"Error loading semantic cache: {e}")
+
+    def stats(self) -> dict:
+        """Get cache hit/miss counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": self._size
+        }
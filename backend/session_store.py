@@ -0,0 +1,88 @@
+"""
+Session Store - Holds active interview sessions
+Keeps sessions in process memory by default, or in Redis so that several
+Uvicorn/Gunicorn workers can serve the same interview
+"""
+
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+import orjson
+
+from interview_manager import InterviewManager
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Active InterviewManager sessions keyed by session ID"""
+
+    def __init__(
+        self,
+        restore: Callable[[dict], InterviewManager],
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 7200
+    ):
+        """
+        Initialize session store
+
+        Args:
+            restore: Rebuilds an InterviewManager from its to_dict() snapshot
+            redis_url: Redis URL for a shared store (or set SESSION_REDIS_URL env var)
+            ttl_seconds: Expiry of idle sessions stored in Redis
+        """
+        self._restore = restore
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, InterviewManager] = {}
+        self._redis = None
+
+        redis_url = redis_url or os.getenv("SESSION_REDIS_URL")
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+
+                self._redis = redis.from_url(redis_url)
+                logger.info("Session store using Redis backend")
+            except ImportError:
+                logger.warning("redis not installed. Run: pip install redis")
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"interview:session:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[InterviewManager]:
+        """Get an active session, or None if it does not exist"""
+        if self._redis is None:
+            return self._sessions.get(session_id)
+
+        raw = await self._redis.get(self._key(session_id))
+        if raw is None:
+            return None
+        return self._restore(orjson.loads(raw))
+
+    async def put(self, interview_manager: InterviewManager):
+        """Store a session (call again after every state change)"""
+        if self._redis is None:
+            self._sessions[interview_manager.session_id] = interview_manager
+            return
+
+        # A streamed turn scores its answer in the background. The snapshot must
+        # include that score, or the next request (possibly in another worker)
+        # would score the answer again
+        await interview_manager.wait_for_evaluation()
+        await self._redis.set(
+            self._key(interview_manager.session_id),
+            orjson.dumps(interview_manager.to_dict()),
+            ex=self.ttl_seconds
+        )
+
+    async def pop(self, session_id: str) -> Optional[InterviewManager]:
+        """Remove a session, returning it if it existed"""
+        if self._redis is None:
+            return self._sessions.pop(session_id, None)
+
+        raw = await self._redis.getdel(self._key(session_id))
+        if raw is None:
+            return None
+        return self._restore(orjson.loads(raw))
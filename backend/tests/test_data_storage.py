@@ -0,0 +1,142 @@
+"""
+Data Storage tests
+
+Run from backend/: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from data_storage import DataStorage, SQLiteDataStorage
+from interview_manager import new_session_id
+
+
+class DataStorageTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.storage_dir = self._tmp.name
+
+    def open_storage(self) -> DataStorage:
+        storage = DataStorage(self.storage_dir)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_workers_sharing_a_directory_index_each_others_answers(self):
+        first = self.open_storage()
+        second = self.open_storage()
+        first.save_answer("s1", "Q1", "first answer", 7)
+        second.save_answer("s2", "Q1", "other candidate", 4)
+        first.save_answer("s1", "Q2", "second answer", 8)
+
+        for storage in (first, second, self.open_storage()):
+            self.assertEqual(
+                [answer["answer"] for answer in storage.get_all_answers("s1")],
+                ["first answer", "second answer"]
+            )
+            self.assertEqual(
+                [answer["answer"] for answer in storage.get_all_answers("s2")],
+                ["other candidate"]
+            )
+
+        with open(os.path.join(self.storage_dir, "answers.idx"), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_rebuilds_a_deleted_answer_index(self):
+        storage = self.open_storage()
+        storage.save_answer("s1", "Q1", "first answer", 7)
+        storage.save_answer("s2", "Q1", "other candidate", 4)
+        storage.save_answer("s1", "Q2", "second answer", 8)
+        storage.close()
+        os.remove(os.path.join(self.storage_dir, "answers.idx"))
+
+        reopened = self.open_storage()
+        self.assertEqual(
+            [answer["answer"] for answer in reopened.get_all_answers("s1")],
+            ["first answer", "second answer"]
+        )
+        self.assertEqual(reopened.get_all_answers("missing"), [])
+        with open(os.path.join(self.storage_dir, "answers.idx"), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+class StorageRoundTripMixin:
+    """Save through one storage instance and read back through a fresh one"""
+
+    storage_class = None
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def open_storage(self):
+        storage = self.storage_class(self._tmp.name)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_saved_data_survives_reopening(self):
+        session_id = f"{1700000000000:013x}abcdef001"
+        interview = {
+            "session_id": session_id,
+            "candidate_name": "Ada",
+            "average_score": 7.5,
+            "questions_and_answers": [
+                {"question_number": 1, "question": "Q1", "answer": "A1", "score": 7},
+                {"question_number": 2, "question": "Q2", "answer": "A2", "score": 8}
+            ],
+            "timestamp": "2023-11-14T22:13:20"
+        }
+        storage = self.open_storage()
+        storage.save_job_description("Python developer", session_id, timestamp="2023-11-14T22:13:20")
+        storage.save_answer(session_id, "Q1", "A1", 7, timestamp="2023-11-14T22:14:00")
+        storage.save_answer(session_id, "Q2", "A2", 8, timestamp="2023-11-14T22:15:00")
+        storage.save_interview_session(interview)
+        storage.close()
+
+        reopened = self.open_storage()
+        self.assertEqual(reopened.get_interview_by_id(session_id), interview)
+        self.assertEqual(reopened.get_all_interviews(), [interview])
+        self.assertEqual(reopened.get_interviews_between(1700000000, 1700000001), [interview])
+        self.assertEqual(reopened.get_interviews_between(1600000000, 1699999999), [])
+        self.assertEqual(
+            reopened.get_all_job_descriptions(),
+            [{"session_id": session_id, "job_description": "Python developer", "timestamp": "2023-11-14T22:13:20"}]
+        )
+        self.assertEqual(
+            [(answer["question"], answer["answer"], answer["score"]) for answer in reopened.get_all_answers(session_id)],
+            [("Q1", "A1", 7), ("Q2", "A2", 8)]
+        )
+        self.assertEqual(reopened.get_statistics(), {
+            "total_interviews": 1, "average_score": 7.5, "total_questions": 2, "total_answers": 2
+        })
+
+
+class DataStorageRoundTripTest(StorageRoundTripMixin, unittest.TestCase):
+    storage_class = DataStorage
+
+
+class SQLiteDataStorageRoundTripTest(StorageRoundTripMixin, unittest.TestCase):
+    storage_class = SQLiteDataStorage
+
+
+class StartedMsTest(unittest.TestCase):
+    def test_reads_start_time_from_new_session_id(self):
+        before = int(time.time() * 1000)
+        session_id = new_session_id()
+        after = int(time.time() * 1000)
+
+        started_ms = DataStorage._started_ms({"session_id": session_id})
+        self.assertTrue(before <= started_ms <= after)
+
+    def test_reads_start_time_from_earlier_session_ids(self):
+        self.assertEqual(DataStorage._started_ms({"session_id": f"{1700000000000:013x}abc001"}), 1700000000000)
+        self.assertEqual(
+            DataStorage._started_ms({"session_id": "1b4e28ba", "started_at": "2024-01-01T12:00:00+00:00"}),
+            1704110400000
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
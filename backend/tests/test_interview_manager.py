@@ -0,0 +1,276 @@
+"""
+Interview Manager tests, run against a scripted stand-in for LLMEngine
+
+Run from backend/: python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+
+import orjson
+
+import interview_manager
+from interview_manager import InterviewManager, InterviewState
+from session_store import SessionStore
+
+
+def _evaluation(score: float) -> dict:
+    return {"score": score, "strengths": ["clear"], "improvements": ["depth"]}
+
+
+class FakeLLMEngine:
+    """Answers every call at once; records the calls it received"""
+
+    def __init__(self, score: float = 7, hire_recommendation: str = "yes", evaluation_delay: float = 0):
+        self.score = score
+        self.hire_recommendation = hire_recommendation
+        self.evaluation_delay = evaluation_delay
+        self.calls = []
+        self.fail_next_question = False
+        self.fail_next_evaluation = False
+
+    async def generate_question(self, question_number=1, **kwargs):
+        self.calls.append("generate_question")
+        if self.fail_next_question:
+            self.fail_next_question = False
+            raise RuntimeError("Gemini unavailable")
+        return f"Question {question_number}?"
+
+    async def generate_question_stream(self, question_number=1, **kwargs):
+        self.calls.append("generate_question_stream")
+        for chunk in (f"Question {question_number}", "?"):
+            yield chunk
+
+    async def evaluate_answer(self, **kwargs):
+        self.calls.append("evaluate_answer")
+        await asyncio.sleep(self.evaluation_delay)
+        if self.fail_next_evaluation:
+            self.fail_next_evaluation = False
+            raise RuntimeError("Gemini unavailable")
+        return _evaluation(self.score)
+
+    async def evaluate_answers(self, questions_and_answers, **kwargs):
+        self.calls.append("evaluate_answers")
+        return [_evaluation(self.score) for _ in questions_and_answers]
+
+    async def evaluate_and_next(self, question, answer, question_number=2, **kwargs):
+        self.calls.append("evaluate_and_next")
+        if self.fail_next_question:
+            self.fail_next_question = False
+            raise RuntimeError("Gemini unavailable")
+        return _evaluation(self.score), f"Question {question_number}?"
+
+    async def stream_final_feedback(self, **kwargs):
+        self.calls.append("stream_final_feedback")
+        yield "{}"
+
+    def parse_final_feedback(self, response_text, average_score):
+        return {"summary": "Solid", "hire_recommendation": self.hire_recommendation}
+
+
+class FakeDataStorage:
+    """Records the answers and sessions it is asked to save"""
+
+    def __init__(self):
+        self.answers = []
+        self.sessions = []
+
+    def save_job_description(self, *args, **kwargs):
+        pass
+
+    def save_answer(self, session_id, question, answer, score, timestamp=None):
+        self.answers.append((question, answer, score))
+
+    def save_interview_session(self, session_data):
+        self.sessions.append(session_data)
+
+
+class FakeRedis:
+    """The slice of redis.asyncio that SessionStore uses"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def getdel(self, key):
+        return self.values.pop(key, None)
+
+
+class InterviewManagerTest(unittest.IsolatedAsyncioTestCase):
+    def make_manager(self, **kwargs) -> InterviewManager:
+        self.engine = FakeLLMEngine(**kwargs)
+        manager = InterviewManager(self.engine, "Python developer", candidate_name="Ada")
+        manager.total_questions = 2
+        return manager
+
+    async def test_streamed_report_sends_one_hire_recommendation(self):
+        # Average 9 maps to "strong yes"; the LLM feedback says "maybe"
+        manager = self.make_manager(score=9, hire_recommendation="maybe")
+        await manager.generate_first_question()
+        await manager.process_answer("first")
+
+        frames = [frame async for frame in manager.process_answer_stream("second")]
+        prelude = next(frame for frame in frames if frame["type"] == "report")
+        done = frames[-1]
+
+        self.assertNotIn("hire_recommendation", prelude["report"])
+        self.assertEqual(done["result"]["report"]["hire_recommendation"], "maybe")
+        await manager.aclose()
+
+    async def test_redis_store_keeps_background_evaluation(self):
+        manager = self.make_manager(evaluation_delay=0.05)
+        store = SessionStore(restore=lambda data: InterviewManager.from_dict(data, self.engine))
+        store._redis = FakeRedis()
+        await manager.generate_first_question()
+
+        frames = [frame async for frame in manager.process_answer_stream("first")]
+        self.assertIsNone(frames[-1]["result"]["previous_score"])
+        await store.put(manager)
+
+        restored = await store.get(manager.session_id)
+        self.assertEqual(restored.scores, [7])
+        await restored.process_answer("second")
+        # One scoring call per answer: the first is not scored again
+        self.assertEqual(self.engine.calls.count("evaluate_answer"), 2)
+        await manager.aclose()
+        await restored.aclose()
+
+    async def test_batch_scored_answers_are_saved(self):
+        manager = self.make_manager()
+        manager.data_storage = FakeDataStorage()
+        await manager.generate_first_question()
+
+        # The background scoring fails, so the next turn batch-scores the answer
+        self.engine.fail_next_evaluation = True
+        [frame async for frame in manager.process_answer_stream("first")]
+        await manager.process_answer("second")
+        await manager.aclose()
+
+        self.assertIn("evaluate_answers", self.engine.calls)
+        self.assertEqual(
+            manager.data_storage.answers,
+            [("Question 1?", "first", 7), ("Question 2?", "second", 7)]
+        )
+
+    async def test_llm_slots_available_counts_held_slots(self):
+        manager = self.make_manager()
+        seen = []
+
+        async def generate_question_stream(**kwargs):
+            seen.append(interview_manager.llm_slots_available())
+            yield "Question 2?"
+
+        self.engine.generate_question_stream = generate_question_stream
+        limit = interview_manager.LLM_MAX_CONCURRENCY
+        self.assertEqual(interview_manager.llm_slots_available(), limit)
+
+        await manager.generate_first_question()
+        [frame async for frame in manager.process_answer_stream("first")]
+        await manager.wait_for_evaluation()
+
+        self.assertEqual(seen, [limit - 1])
+        self.assertEqual(interview_manager.llm_slots_available(), limit)
+        await manager.aclose()
+
+    async def test_resubmitted_answer_resumes_failed_turn(self):
+        manager = self.make_manager()
+        await manager.generate_first_question()
+
+        self.engine.fail_next_question = True
+        with self.assertRaises(RuntimeError):
+            await manager.process_answer("first")
+        self.assertIs(manager.state, InterviewState.EVALUATING)
+
+        result = await manager.process_answer("first")
+        self.assertEqual(result["question"], "Question 2?")
+        self.assertIs(manager.state, InterviewState.AWAITING_ANSWER)
+        self.assertEqual(manager.answers_given, ["first"])
+        self.assertEqual(manager.scores, [7])
+
+    async def test_resumed_turn_keeps_finished_evaluation(self):
+        manager = self.make_manager()
+        await manager.generate_first_question()
+
+        async def failing_stream(**kwargs):
+            raise RuntimeError("Gemini unavailable")
+            yield
+
+        self.engine.generate_question_stream = failing_stream
+        with self.assertRaises(RuntimeError):
+            [frame async for frame in manager.process_answer_stream("first")]
+        await manager.wait_for_evaluation()
+        self.assertIs(manager.state, InterviewState.EVALUATING)
+
+        result = await manager.process_answer("first")
+        self.assertEqual(result["question"], "Question 2?")
+        self.assertEqual(self.engine.calls.count("evaluate_answer"), 1)
+        self.assertNotIn("evaluate_and_next", self.engine.calls)
+        self.assertEqual(manager.scores, [7])
+
+    async def test_different_answer_discards_failed_turn(self):
+        manager = self.make_manager()
+        await manager.generate_first_question()
+
+        async def failing_stream(**kwargs):
+            raise RuntimeError("Gemini unavailable")
+            yield
+
+        self.engine.generate_question_stream = failing_stream
+        with self.assertRaises(RuntimeError):
+            [frame async for frame in manager.process_answer_stream("first")]
+        await manager.wait_for_evaluation()
+
+        self.engine.score = 4
+        await manager.process_answer("revised")
+        self.assertEqual(manager.answers_given, ["revised"])
+        self.assertEqual(manager.scores, [4])
+        self.assertEqual(len(manager.evaluations), 1)
+
+    async def test_answer_before_start_or_after_end_is_rejected(self):
+        manager = self.make_manager()
+        with self.assertRaises(ValueError):
+            await manager.process_answer("too early")
+
+        await manager.generate_first_question()
+        await manager.process_answer("first")
+        await manager.process_answer("second")
+        self.assertIs(manager.state, InterviewState.COMPLETE)
+        with self.assertRaises(ValueError):
+            await manager.process_answer("too late")
+        await manager.aclose()
+
+    async def test_snapshot_round_trip(self):
+        manager = self.make_manager()
+        await manager.generate_first_question()
+        await manager.process_answer("first")
+
+        snapshot = orjson.loads(orjson.dumps(manager.to_dict()))
+        restored = InterviewManager.from_dict(snapshot, self.engine)
+        self.assertEqual(restored.to_dict(), manager.to_dict())
+        self.assertIs(restored.state, InterviewState.AWAITING_ANSWER)
+        self.assertEqual(restored.started_at, manager.started_at)
+
+        result = await restored.process_answer("second")
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["report"]["average_score"], 7)
+        await restored.aclose()
+
+    def test_snapshot_without_state_restores_between_turns(self):
+        manager = self.make_manager()
+        snapshot = manager.to_dict()
+        del snapshot["state"]
+
+        self.assertIs(InterviewManager.from_dict(snapshot, self.engine).state, InterviewState.READY)
+        snapshot["interview_started"] = True
+        self.assertIs(InterviewManager.from_dict(snapshot, self.engine).state, InterviewState.AWAITING_ANSWER)
+        snapshot["interview_ended"] = True
+        self.assertIs(InterviewManager.from_dict(snapshot, self.engine).state, InterviewState.COMPLETE)
+
+
+if __name__ == "__main__":
+    unittest.main()
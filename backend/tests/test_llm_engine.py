@@ -0,0 +1,181 @@
+"""
+LLM Engine tests, run against a stand-in for the Gemini SDK
+
+Run from backend/: python -m unittest discover tests
+"""
+
+import asyncio
+import sys
+import types
+import unittest
+
+
+def _install_fake_sdk():
+    """Register minimal google.generativeai / google.api_core modules"""
+    google = types.ModuleType("google")
+    genai = types.ModuleType("google.generativeai")
+    caching = types.ModuleType("google.generativeai.caching")
+    api_core = types.ModuleType("google.api_core")
+    exceptions = types.ModuleType("google.api_core.exceptions")
+
+    class ResourceExhausted(Exception):
+        pass
+
+    class GenerationConfig(dict):
+        def __init__(self, **kwargs):
+            super().__init__({key: value for key, value in kwargs.items() if value is not None})
+
+    class GenerativeModel:
+        def __init__(self, model_name, system_instruction=None):
+            self.model_name = model_name
+            self.system_instruction = system_instruction
+
+    exceptions.ResourceExhausted = ResourceExhausted
+    api_core.exceptions = exceptions
+    genai.caching = caching
+    genai.configure = lambda **kwargs: None
+    genai.GenerationConfig = GenerationConfig
+    genai.GenerativeModel = GenerativeModel
+    google.generativeai = genai
+    google.api_core = api_core
+    sys.modules.setdefault("google", google)
+    sys.modules.setdefault("google.generativeai", genai)
+    sys.modules.setdefault("google.generativeai.caching", caching)
+    sys.modules.setdefault("google.api_core", api_core)
+    sys.modules.setdefault("google.api_core.exceptions", exceptions)
+
+
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    _install_fake_sdk()
+
+import llm_engine
+import semantic_cache
+from llm_engine import LLMEngine
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class LLMEngineGenerateTest(unittest.IsolatedAsyncioTestCase):
+    def make_engine(self, **kwargs):
+        engine = LLMEngine(api_key="test-key", requests_per_minute=0, tokens_per_minute=0, **kwargs)
+        self.sends = []
+
+        async def send(model, prompt, task=None, **send_kwargs):
+            self.sends.append((model, prompt, task, send_kwargs))
+            await asyncio.sleep(0.01)
+            return _Response('{"score": 7}')
+
+        engine._send = send
+        return engine
+
+    async def test_generate_passes_task_to_send(self):
+        engine = self.make_engine(temperature=0)
+        await engine._generate("prompt", task="evaluation")
+
+        self.assertEqual(len(self.sends), 1)
+        model, _, task, _ = self.sends[0]
+        self.assertEqual(task, "evaluation")
+        self.assertIs(model, engine._task_models["evaluation"])
+
+    async def test_send_applies_task_generation_config(self):
+        engine = LLMEngine(api_key="test-key", temperature=0, requests_per_minute=0, tokens_per_minute=0)
+        configs = []
+
+        async def generate_content_async(prompt, generation_config=None, **kwargs):
+            configs.append(generation_config)
+            return _Response('{"score": 7}')
+
+        for model in engine._task_models.values():
+            model.generate_content_async = generate_content_async
+
+        await engine._generate("prompt", task="evaluation")
+
+        self.assertEqual(configs, [engine._task_configs["evaluation"]])
+        self.assertEqual(configs[0]["response_mime_type"], "application/json")
+        self.assertIs(configs[0]["response_schema"], llm_engine.EVALUATION_SCHEMA)
+
+    async def test_identical_concurrent_requests_share_one_send(self):
+        engine = self.make_engine(temperature=0)
+        results = await asyncio.gather(
+            engine._generate("prompt", task="turn"),
+            engine._generate("prompt", task="turn")
+        )
+
+        self.assertEqual(results, ['{"score": 7}', '{"score": 7}'])
+        self.assertEqual(len(self.sends), 1)
+        self.assertEqual(self.sends[0], (engine._task_models["turn"], "prompt", "turn", {}))
+        self.assertEqual(engine._inflight, {})
+
+        # The uncached path sends the same request
+        await engine._generate_uncached(
+            "prompt", engine._task_models["turn"], None, False, "turn"
+        )
+        self.assertEqual(self.sends[1], self.sends[0])
+
+    async def test_default_temperature_caches_scoring_but_not_questions(self):
+        engine = self.make_engine()
+        for _ in range(2):
+            await engine._generate("prompt", task="question")
+            await engine._generate("prompt", task="evaluation")
+
+        self.assertEqual([task for _, _, task, _ in self.sends], ["question", "evaluation", "question"])
+        self.assertEqual(engine._task_configs["evaluation"]["temperature"], 0.0)
+
+
+@unittest.skipIf(semantic_cache.np is None, "numpy not installed")
+class SemanticCacheTest(unittest.IsolatedAsyncioTestCase):
+    def make_cache(self, vectors):
+        cache = semantic_cache.SemanticCache(threshold=0.9)
+
+        async def embed(text):
+            vector = semantic_cache.np.asarray(vectors[text], dtype=semantic_cache.np.float32)
+            return vector / semantic_cache.np.linalg.norm(vector)
+
+        cache.embed = embed
+        return cache
+
+    async def test_lookup_hits_similar_prompt(self):
+        cache = self.make_cache({"first": [1.0, 0.0], "similar": [1.0, 0.1], "other": [0.0, 1.0]})
+        response, vector = await cache.lookup("first")
+        self.assertIsNone(response)
+        cache.add(vector, "What is a closure?")
+
+        self.assertEqual((await cache.lookup("similar"))[0], "What is a closure?")
+        self.assertIsNone((await cache.lookup("other"))[0])
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "size": 1})
+
+    async def test_engine_reuses_question_for_similar_prompt(self):
+        cache = self.make_cache({"prompt": [1.0, 0.0], "prompt, reworded": [1.0, 0.05]})
+        engine = LLMEngine(
+            api_key="test-key", temperature=0, semantic_cache=cache,
+            requests_per_minute=0, tokens_per_minute=0
+        )
+        sends = []
+
+        async def send(model, prompt, task=None, **kwargs):
+            sends.append(task)
+            return _Response("What is a closure?")
+
+        engine._send = send
+        first = await engine._generate("prompt", task="question")
+        second = await engine._generate("prompt, reworded", task="question")
+
+        self.assertEqual((first, second), ("What is a closure?", "What is a closure?"))
+        self.assertEqual(sends, ["question"])
+        self.assertEqual(cache.hits, 1)
+
+    def test_semantic_cache_needs_temperature_zero(self):
+        engine = LLMEngine(
+            api_key="test-key", semantic_cache=self.make_cache({}),
+            requests_per_minute=0, tokens_per_minute=0
+        )
+        self.assertIsNone(engine.semantic_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()